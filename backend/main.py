@@ -5,23 +5,36 @@ Mounts the MCP server (SSE transport) and includes an MCP agent that connects
 to it as a real MCP client for the MCP Playground.
 """
 
-import json
+import asyncio
+import atexit
 import os
 import logging
-from typing import Optional
-
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.middleware.cors import CORSMiddleware
+import logging.handlers
+import queue
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterator, Optional
+
+import httpx
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware
 from pydantic import BaseModel, Field
 from sse_starlette.sse import EventSourceResponse
 
-from src.article_finder import find_articles
-from src.article_reader import get_article_details, list_all_topics, get_articles_by_topic
-from src.summarizer import summarize_article, explain_like_ten, summarize_with_claude
-from src.chat_engine import chat_about_article
-from src.mcp_agent import run_mcp_agent
+from src.article_finder import find_articles_async
+from src.article_reader import get_article_details, list_all_topics, get_articles_by_topic_async
+from src.summarizer import summarize_article, explain_like_ten, summarize_with_claude, summarize_with_claude_batch
+from src.chat_engine import chat_about_article_async, chat_about_article_stream
+from src.semantic_cache import chat_cache, embed_text
+from src.executors import STREAM_EXECUTOR
+from src.mcp_agent import run_mcp_agent, cleanup_idle_sessions, close_session_pool
+from src.http_session import aclose_async_http
 from src.topic_suggester import suggest_topic
 from src.config import DEFAULT_MAX_RESULTS
+from src.cors import FastCORS
 from mcp_server import mcp as mcp_server_instance
 from src.security import (
     check_chat_rate_limit,
@@ -39,10 +52,67 @@ from src.security import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records untouched. The stock prepare()
+    formats the message in the calling thread so records can be pickled;
+    this queue never leaves the process, so the listener formats instead.
+    (Log args are therefore read when written, not when logged.)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Request handlers only enqueue log records; a background listener thread
+# does the formatting and the blocking stream writes.
+_root_logger = logging.getLogger()
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [_DeferredQueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson (C) instead of stdlib json.
+    Defined here because fastapi.responses.ORJSONResponse is deprecated
+    in recent FastAPI releases.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    # One keep-alive HTTP/2 client for arXiv, reused by every search
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+    # Closes pooled MCP agent sessions once they sit idle
+    session_reaper = asyncio.create_task(cleanup_idle_sessions())
+    yield
+    session_reaper.cancel()
+    await close_session_pool()
+    await app.state.http.aclose()
+    await aclose_async_http()
+    STREAM_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+
 app = FastAPI(
     title="ArXiv Scholar AI",
     description="AI-powered research paper discovery and summarization",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS: Only allow our known frontends, not the entire internet.
@@ -52,14 +122,23 @@ _default_origins = "http://localhost:3000,http://127.0.0.1:3000"
 _origins_str = os.getenv("ALLOWED_ORIGINS", _default_origins)
 allowed_origins = [o.strip() for o in _origins_str.split(",") if o.strip()]
 
+# FastCORS: a set lookup per request instead of CORSMiddleware's generic checks.
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
+    FastCORS,
+    allowed_origins=allowed_origins,
     allow_methods=["GET", "POST"],
     allow_headers=["Content-Type"],
 )
 
+# Gzip responses over 1 KB, including the SSE streams: tool_result events
+# carry full paper JSON. Streamed bodies are sync-flushed per chunk, so
+# each event still reaches the client as soon as it is sent.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    exclude_content_types=tuple(t for t in DEFAULT_EXCLUDED_CONTENT_TYPES if t != "text/event-stream"),
+)
+
 # Mount the MCP server's SSE transport at /mcp.
 # Any MCP client (Claude Desktop, Cursor, our own agent) can connect to /mcp/sse.
 app.mount("/mcp", mcp_server_instance.sse_app())
@@ -89,6 +168,14 @@ class SummaryResponse(BaseModel):
     ai_summary: Optional[str]
 
 
+class BatchSummaryRequest(BaseModel):
+    article_ids: list[str] = Field(..., min_length=1, max_length=20)
+
+
+class BatchSummaryResponse(BaseModel):
+    summaries: dict[str, Optional[str]]
+
+
 class TopicsResponse(BaseModel):
     topics: list[str]
 
@@ -112,6 +199,133 @@ class ChatResponse(BaseModel):
     suggestion: Optional[str] = None
 
 
+# Encoded /api/search results, (count, articles JSON), keyed by the
+# normalized query. Repeat searches (back/forward, reopened tabs, popular
+# topics) skip arXiv and re-encoding; only the requester's own topic is
+# encoded per response.
+_search_cache: TTLCache = TTLCache(maxsize=512, ttl=600)
+_search_cache_lock = threading.Lock()
+
+
+def _search_body(topic: str, count: int, articles_json: bytes) -> bytes:
+    """A SearchResponse body around already-encoded articles."""
+    return b'{"topic":' + orjson.dumps(topic) + b',"count":%d,"articles":' % count + articles_json + b"}"
+
+
+# Seconds the semantic cache lookup may spend embedding a chat question
+CHAT_EMBED_TIMEOUT = 1.0
+
+# Constant 404 message: no per-request formatting, and user input is never
+# echoed back in the response body.
+ARTICLE_404_DETAIL = "Article not found. Try searching for it first."
+
+
+# --- Streaming Helpers ---
+
+_STREAM_END = object()
+
+
+def _sse_data(event: Any) -> bytes:
+    """
+    A complete SSE `data:` frame for one JSON event. EventSourceResponse
+    passes bytes through untouched, skipping its str framing and re-encode;
+    orjson never emits raw newlines, so one data line is always enough.
+    """
+    return b"data: " + orjson.dumps(event) + b"\r\n\r\n"
+
+
+# Agent steps produced within this many seconds of each other are written
+# to the client as one chunk (one TCP write, one gzip flush)
+SSE_COALESCE_WINDOW = 0.01
+
+
+async def _coalesced_sse(events: AsyncIterator[dict], window: float = SSE_COALESCE_WINDOW) -> AsyncIterator[bytes]:
+    """
+    Frame agent steps as SSE, joining bursts (e.g. several tool_call steps
+    announced together) into a single chunk. Each step is still its own
+    `data:` frame, so clients see no difference. answer_delta steps end a
+    chunk immediately to keep streamed text snappy.
+    """
+    loop = asyncio.get_running_loop()
+    steps = events.__aiter__()
+    # The pending __anext__ is never cancelled by a timeout: cancelling it
+    # would throw into the agent generator and end the run
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(steps.__anext__())
+            try:
+                step = await pending
+            except StopAsyncIteration:
+                return
+            pending = None
+
+            chunk = [_sse_data(step)]
+            deadline = loop.time() + window
+            while step.get("type") != "answer_delta":
+                pending = asyncio.ensure_future(steps.__anext__())
+                done, _ = await asyncio.wait({pending}, timeout=max(0.0, deadline - loop.time()))
+                if not done:
+                    break
+                pending = None
+                try:
+                    step = done.pop().result()
+                except StopAsyncIteration:
+                    yield b"".join(chunk)
+                    return
+                chunk.append(_sse_data(step))
+            yield b"".join(chunk)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+# Items a worker may run ahead of a slow client before it blocks
+STREAM_QUEUE_SIZE = 64
+
+
+async def _iterate_in_worker(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """
+    Drive a blocking iterator in a single STREAM_EXECUTOR thread and hand its
+    items to the event loop through a queue. One thread hop for the whole
+    stream instead of one per item.
+
+    The queue is bounded, so a client that reads slowly makes the worker
+    (and the upstream LLM stream it reads) wait instead of buffering
+    without limit. If the client goes away, the worker stops early.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    closed = threading.Event()
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def drain():
+        try:
+            for item in iterator:
+                if closed.is_set():
+                    break
+                put(item)
+        finally:
+            put(_STREAM_END)
+
+    worker = loop.run_in_executor(STREAM_EXECUTOR, drain)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            yield item
+        await worker
+    finally:
+        # Unblock a worker waiting on a full queue so it sees `closed`
+        closed.set()
+        while not queue.empty():
+            queue.get_nowait()
+
+
 # --- API Endpoints ---
 
 @app.get("/")
@@ -152,23 +366,35 @@ async def search_articles(
     check_search_rate_limit(request)
     validate_search_input(topic)
 
+    cache_key = (topic.lower().strip(), max_results, sort_by, date_from, date_to)
+    with _search_cache_lock:
+        cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=_search_body(topic, *cached), media_type="application/json")
+
     try:
-        articles = find_articles(
+        articles = await find_articles_async(
+            request.app.state.http,
             topic=topic,
             max_results=max_results,
             sort_by=sort_by,
             date_from=date_from,
             date_to=date_to,
         )
-        return SearchResponse(
-            topic=topic,
-            count=len(articles),
-            articles=[ArticleResponse(**a) for a in articles],
-        )
     except Exception as e:
-        logger.error(f"Search failed for topic '{topic}': {e}")
+        logger.error("Search failed for topic '%s': %s", topic, e)
         raise HTTPException(status_code=500, detail="The server is warming up or arXiv is temporarily unavailable. Please try again in a moment.")
 
+    # Articles come from our own finder, so skip re-validating each one.
+    # User input (e.g. ChatRequest) is still fully validated.
+    articles_json = b"[" + b",".join(
+        ArticleResponse.model_construct(**a).model_dump_json().encode() for a in articles
+    ) + b"]"
+
+    with _search_cache_lock:
+        _search_cache[cache_key] = (len(articles), articles_json)
+    return Response(content=_search_body(topic, len(articles), articles_json), media_type="application/json")
+
 
 @app.get("/api/article/{article_id}", response_model=ArticleResponse)
 async def read_article(request: Request, article_id: str):
@@ -181,9 +407,9 @@ async def read_article(request: Request, article_id: str):
     if article is None:
         raise HTTPException(
             status_code=404,
-            detail=f"Article '{article_id}' not found. Try searching for it first.",
+            detail=ARTICLE_404_DETAIL,
         )
-    return ArticleResponse(**article)
+    return ArticleResponse.model_construct(**article)
 
 
 @app.get("/api/summarize/{article_id}", response_model=SummaryResponse)
@@ -197,12 +423,12 @@ async def summarize(request: Request, article_id: str):
     if article is None:
         raise HTTPException(
             status_code=404,
-            detail=f"Article '{article_id}' not found. Try searching for it first.",
+            detail=ARTICLE_404_DETAIL,
         )
 
     ai_summary = summarize_article(article)
 
-    return SummaryResponse(
+    return SummaryResponse.model_construct(
         article_id=article_id,
         title=article.get("title", "Unknown"),
         ai_summary=ai_summary,
@@ -220,12 +446,12 @@ async def explain_simple(request: Request, article_id: str):
     if article is None:
         raise HTTPException(
             status_code=404,
-            detail=f"Article '{article_id}' not found. Try searching for it first.",
+            detail=ARTICLE_404_DETAIL,
         )
 
     simple_explanation = explain_like_ten(article)
 
-    return SummaryResponse(
+    return SummaryResponse.model_construct(
         article_id=article_id,
         title=article.get("title", "Unknown"),
         ai_summary=simple_explanation,
@@ -243,18 +469,41 @@ async def summarize_claude(request: Request, article_id: str):
     if article is None:
         raise HTTPException(
             status_code=404,
-            detail=f"Article '{article_id}' not found. Try searching for it first.",
+            detail=ARTICLE_404_DETAIL,
         )
 
     ai_summary = summarize_with_claude(article)
 
-    return SummaryResponse(
+    return SummaryResponse.model_construct(
         article_id=article_id,
         title=article.get("title", "Unknown"),
         ai_summary=ai_summary,
     )
 
 
+@app.post("/api/summarize-ai/batch", response_model=BatchSummaryResponse)
+async def summarize_claude_batch(request: Request, batch_request: BatchSummaryRequest):
+    """
+    Generate Claude summaries for several papers in one request.
+    Articles are looked up concurrently and summarized with bounded
+    concurrency. Unknown article IDs map to null.
+    """
+    article_ids = list(dict.fromkeys(batch_request.article_ids))
+    # Each paper is a paid Claude call, so charge it like /api/summarize-ai/{id}
+    check_general_rate_limit(request, cost=len(article_ids))
+
+    articles = await asyncio.gather(
+        *(asyncio.to_thread(get_article_details, article_id) for article_id in article_ids)
+    )
+    found = [article for article in articles if article is not None]
+
+    summaries = await asyncio.to_thread(summarize_with_claude_batch, found)
+
+    return BatchSummaryResponse.model_construct(
+        summaries={article_id: summaries.get(article_id) for article_id in article_ids},
+    )
+
+
 @app.get("/api/topics", response_model=TopicsResponse)
 async def get_topics(request: Request):
     """
@@ -272,7 +521,7 @@ async def get_topic_articles(request: Request, topic_slug: str):
     """
     check_general_rate_limit(request)
 
-    articles = get_articles_by_topic(topic_slug)
+    articles = await get_articles_by_topic_async(topic_slug)
     if not articles:
         raise HTTPException(
             status_code=404,
@@ -295,44 +544,108 @@ async def mcp_query(request: Request, q: str = Query(..., description="Natural l
     """
     check_search_rate_limit(request)
 
-    async def event_generator():
-        async for step in run_mcp_agent(q):
-            yield json.dumps(step)
-
-    return EventSourceResponse(event_generator())
+    return EventSourceResponse(_coalesced_sse(run_mcp_agent(q)))
 
 
-@app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: Request, chat_request: ChatRequest):
+# response_model=None: the result is built from our own chat engine output,
+# so skip FastAPI's second validation pass. ChatResponse still documents it.
+@app.post("/api/chat", response_model=None, responses={200: {"model": ChatResponse}})
+async def chat(
+    request: Request,
+    chat_request: ChatRequest,
+    no_cache: bool = Query(False, description="Skip the semantic answer cache"),
+):
     """
     Chat about a paper -- Explain Like I'm 10 interactive chatbot.
     Supports xAI Grok, Google Gemini, and Anthropic Claude.
     Protected by rate limiting, input validation, and prompt injection detection.
+    Opening questions are answered from a semantic cache when a paraphrase
+    was already asked about the same paper.
     """
     check_chat_rate_limit(request)
     validate_chat_input(chat_request.message, len(chat_request.history))
 
     if check_prompt_injection(chat_request.message):
-        return ChatResponse(
-            response="I can only help explain this research paper in simple words. Could you ask me something about the paper instead?",
-            provider="safety",
+        return ORJSONResponse({
+            "response": "I can only help explain this research paper in simple words. Could you ask me something about the paper instead?",
+            "provider": "safety",
+            "error_type": None,
+            "suggestion": None,
+        })
+
+    clean_message = sanitize_message(chat_request.message)
+
+    article = get_article_details(chat_request.article_id)
+    if article is None:
+        raise HTTPException(
+            status_code=404,
+            detail=ARTICLE_404_DETAIL,
         )
 
+    # Follow-ups depend on the conversation so far, so only opening
+    # questions go through the semantic cache. The lookup runs before the
+    # LLM call, so a slow embedding is abandoned (and the cache skipped)
+    # rather than delaying every miss.
+    embedding = None
+    if not no_cache and not chat_request.history:
+        embedding = await asyncio.to_thread(embed_text, clean_message, CHAT_EMBED_TIMEOUT)
+        if embedding is not None:
+            cached = chat_cache.get(chat_request.article_id, embedding)
+            if cached is not None:
+                return ORJSONResponse({
+                    "response": cached["response"],
+                    "provider": cached["provider"],
+                    "error_type": None,
+                    "suggestion": None,
+                })
+
+    history = [{"role": msg.role, "content": sanitize_message(msg.content)} for msg in chat_request.history]
+    result = await chat_about_article_async(article, clean_message, history)
+
+    if embedding is not None and not result.get("error_type"):
+        chat_cache.put(chat_request.article_id, embedding, result)
+
+    return ORJSONResponse({
+        "response": result["response"],
+        "provider": result["provider"],
+        "error_type": result.get("error_type"),
+        "suggestion": result.get("suggestion"),
+    })
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: Request, chat_request: ChatRequest):
+    """
+    Streaming version of /api/chat via Server-Sent Events.
+    Emits {"delta": "..."} events as the answer is generated, then a final
+    {"done": true, "provider": ...} event. Same protections as /api/chat.
+    """
+    check_chat_rate_limit(request)
+    validate_chat_input(chat_request.message, len(chat_request.history))
+
+    if check_prompt_injection(chat_request.message):
+        refusal = "I can only help explain this research paper in simple words. Could you ask me something about the paper instead?"
+
+        def refusal_events():
+            yield _sse_data({"delta": refusal})
+            yield _sse_data({"done": True, "provider": "safety"})
+
+        return EventSourceResponse(refusal_events())
+
     clean_message = sanitize_message(chat_request.message)
 
     article = get_article_details(chat_request.article_id)
     if article is None:
         raise HTTPException(
             status_code=404,
-            detail=f"Article '{chat_request.article_id}' not found. Try searching for it first.",
+            detail=ARTICLE_404_DETAIL,
         )
 
     history = [{"role": msg.role, "content": sanitize_message(msg.content)} for msg in chat_request.history]
-    result = chat_about_article(article, clean_message, history, provider=chat_request.provider)
 
-    return ChatResponse(
-        response=result["response"],
-        provider=result["provider"],
-        error_type=result.get("error_type"),
-        suggestion=result.get("suggestion"),
-    )
+    async def event_generator():
+        stream = chat_about_article_stream(article, clean_message, history)
+        async for event in _iterate_in_worker(stream):
+            yield _sse_data(event)
+
+    return EventSourceResponse(event_generator())
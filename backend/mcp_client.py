@@ -13,12 +13,15 @@ import json
 import logging
 import os
 import sys
+from typing import Callable
 
+import httpx
+import orjson
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
-import requests
+from src.tool_schemas import mcp_tools_to_gemini, snapshot_tools
 
 load_dotenv()
 
@@ -29,57 +32,90 @@ GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
 GEMINI_MODEL = "gemini-2.0-flash"
 GEMINI_URL = (
     f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}"
-    f":generateContent?key={GEMINI_API_KEY}"
+    f":streamGenerateContent?alt=sse&key={GEMINI_API_KEY}"
 )
 
 MCP_SERVER_SCRIPT = os.path.join(os.path.dirname(__file__), "mcp_server.py")
 
-
-def call_gemini(messages: list, tools: list | None = None) -> dict:
-    """Call Gemini and return the parsed JSON response."""
-    payload: dict = {"contents": messages}
+# Shared async client: keeps the Gemini connection alive across turns
+# and never blocks the event loop while MCP tool calls are in flight.
+_HTTP = httpx.AsyncClient(timeout=60, http2=True)
+
+
+class Conversation:
+    """
+    Gemini chat history, kept JSON-encoded as it grows. Each turn is
+    serialized once when appended, so a request only has to wrap the
+    already-encoded bytes instead of re-encoding the whole transcript.
+    """
+
+    def __init__(self):
+        self.turns: list = []
+        self._encoded = bytearray()
+
+    def append(self, turn: dict):
+        """Add a turn and encode it."""
+        self.turns.append(turn)
+        if self._encoded:
+            self._encoded += b","
+        self._encoded += orjson.dumps(turn)
+
+    def contents_json(self) -> bytes:
+        """The turns as a JSON array, ready for the "contents" field."""
+        return b"[" + self._encoded + b"]"
+
+
+async def call_gemini(
+    messages: Conversation,
+    tools: list | None = None,
+    on_tool_call: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Stream a Gemini response and return it assembled as a single candidate.
+
+    If on_tool_call is given, it is called with each functionCall as soon as
+    it arrives, so tools can start running while Gemini is still generating.
+    The tools are sent inline on every turn; they are far below the minimum
+    size for explicit cachedContents, so Gemini's implicit prefix caching
+    is what applies to them.
+    """
+    extra: dict = {}
     if tools:
-        payload["tools"] = [{"functionDeclarations": tools}]
+        extra["tools"] = [{"functionDeclarations": tools}]
+
+    # Splice the pre-encoded history into the body rather than re-encoding it
+    body = b'{"contents":' + messages.contents_json()
+    if extra:
+        body += b"," + orjson.dumps(extra)[1:]  # drop the leading "{"
+    else:
+        body += b"}"
+
+    parts: list = []
+    async with _HTTP.stream(
+        "POST", GEMINI_URL, content=body, headers={"Content-Type": "application/json"}
+    ) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            chunk = json.loads(line[5:])
+            candidates = chunk.get("candidates") or [{}]
+            for part in candidates[0].get("content", {}).get("parts", []):
+                if "text" in part and parts and "text" in parts[-1]:
+                    parts[-1]["text"] += part["text"]
+                    continue
+                parts.append(part)
+                if "functionCall" in part and on_tool_call:
+                    on_tool_call(part["functionCall"])
 
-    resp = requests.post(GEMINI_URL, json=payload, timeout=60)
-    resp.raise_for_status()
-    return resp.json()
+    return {"candidates": [{"content": {"role": "model", "parts": parts}}]}
 
 
 def format_tools_for_gemini(mcp_tools: list) -> list:
     """Convert MCP tool descriptors into Gemini function-declaration format."""
-    declarations = []
-    for tool in mcp_tools:
-        schema = tool.inputSchema or {}
-        properties = schema.get("properties", {})
-        required = schema.get("required", [])
-
-        gemini_props = {}
-        for name, prop in properties.items():
-            prop_type = prop.get("type", "string").upper()
-            type_map = {
-                "STRING": "STRING",
-                "INTEGER": "INTEGER",
-                "NUMBER": "NUMBER",
-                "BOOLEAN": "BOOLEAN",
-                "ARRAY": "ARRAY",
-                "OBJECT": "OBJECT",
-            }
-            gemini_props[name] = {
-                "type": type_map.get(prop_type, "STRING"),
-                "description": prop.get("description", ""),
-            }
-
-        declarations.append({
-            "name": tool.name,
-            "description": tool.description or "",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": gemini_props,
-                "required": required,
-            },
-        })
-    return declarations
+    # Keyed on the tool definitions themselves, so re-listing the same tools
+    # (e.g. after a reconnect) reuses the previous conversion.
+    return mcp_tools_to_gemini(snapshot_tools(mcp_tools))
 
 
 def extract_response_text(response: dict) -> str | None:
@@ -134,7 +170,15 @@ async def run_agent():
             tool_names = [t.name for t in tools]
             print(f"\nConnected! Available tools: {', '.join(tool_names)}\n")
 
-            conversation: list = []
+            conversation = Conversation()
+            pending_tools: list = []
+
+            def start_tool(fc: dict):
+                """Kick off a tool call the moment Gemini emits it."""
+                print(f"  [Calling tool: {fc['name']}]")
+                pending_tools.append(
+                    asyncio.ensure_future(session.call_tool(fc["name"], fc.get("args", {})))
+                )
 
             while True:
                 try:
@@ -154,24 +198,28 @@ async def run_agent():
                     "parts": [{"text": user_input}],
                 })
 
-                response = call_gemini(conversation, gemini_tools)
+                response = await call_gemini(conversation, gemini_tools, on_tool_call=start_tool)
                 tool_calls = extract_tool_calls(response)
 
                 while tool_calls:
                     conversation.append(response["candidates"][0]["content"])
 
-                    function_responses = []
-                    for fc in tool_calls:
-                        fn_name = fc["name"]
-                        fn_args = fc.get("args", {})
-                        print(f"  [Calling tool: {fn_name}]")
+                    # Tools were started as their calls streamed in; one
+                    # failing tool shouldn't cancel the rest of the batch.
+                    results = await asyncio.gather(*pending_tools, return_exceptions=True)
+                    pending_tools.clear()
 
-                        result = await session.call_tool(fn_name, fn_args)
-                        result_text = result.content[0].text if result.content else "No result."
+                    function_responses = []
+                    for fc, result in zip(tool_calls, results):
+                        if isinstance(result, Exception):
+                            response_body = {"error": str(result)}
+                        else:
+                            result_text = result.content[0].text if result.content else "No result."
+                            response_body = {"result": result_text}
                         function_responses.append({
                             "functionResponse": {
-                                "name": fn_name,
-                                "response": {"result": result_text},
+                                "name": fc["name"],
+                                "response": response_body,
                             }
                         })
 
@@ -180,7 +228,7 @@ async def run_agent():
                         "parts": function_responses,
                     })
 
-                    response = call_gemini(conversation, gemini_tools)
+                    response = await call_gemini(conversation, gemini_tools, on_tool_call=start_tool)
                     tool_calls = extract_tool_calls(response)
 
                 answer = extract_response_text(response)
@@ -194,5 +242,13 @@ async def run_agent():
                     print("\nAssistant: (no response)\n")
 
 
+async def main():
+    """Run the agent and close the shared HTTP client on the way out."""
+    try:
+        await run_agent()
+    finally:
+        await _HTTP.aclose()
+
+
 if __name__ == "__main__":
-    asyncio.run(run_agent())
+    asyncio.run(main())
@@ -9,15 +9,17 @@ Run locally:  python mcp_remote.py
 Default port: 8001 (or set MCP_PORT env var)
 """
 
+import asyncio
 import logging
 import os
 
 from mcp.server.fastmcp import FastMCP
 
-from src.article_finder import find_articles
 from src.article_reader import get_article_details, list_all_topics, get_articles_by_topic
-from src.summarizer import summarize_article, explain_like_ten as eli10
-from src.chat_engine import chat_about_article
+from src.summarizer import explain_like_ten as eli10
+from src.chat_engine import chat_about_article_async
+from src.tool_cache import cached_find_articles, cached_summary, summarize_many
+from src.mcp_utils import run_in_thread, to_json
 
 import json
 from typing import Optional
@@ -31,6 +33,7 @@ mcp = FastMCP("arxiv-scholar-ai-remote")
 # --------------- Tools (same as stdio server) ---------------
 
 @mcp.tool()
+@run_in_thread
 def search_arxiv(
     topic: str,
     max_results: int = 5,
@@ -40,7 +43,7 @@ def search_arxiv(
 ) -> str:
     """Search arXiv for academic papers on a given topic."""
     max_results = max(1, min(20, max_results))
-    articles = find_articles(
+    articles = cached_find_articles(
         topic=topic,
         max_results=max_results,
         sort_by=sort_by,
@@ -48,7 +51,7 @@ def search_arxiv(
         date_to=date_to,
     )
     if not articles:
-        return json.dumps({"count": 0, "message": f"No papers found for '{topic}'."})
+        return to_json({"count": 0, "message": f"No papers found for '{topic}'."})
 
     results = [{
         "id": a["id"],
@@ -58,28 +61,37 @@ def search_arxiv(
         "pdf_url": a["pdf_url"],
     } for a in articles]
 
-    return json.dumps({"count": len(results), "papers": results}, indent=2)
+    return to_json({"count": len(results), "papers": results})
 
 
 @mcp.tool()
+@run_in_thread
 def get_paper(article_id: str) -> str:
     """Get full metadata for a specific arXiv paper by its ID."""
     article = get_article_details(article_id)
     if not article:
-        return json.dumps({"error": f"Paper '{article_id}' not found."})
-    return json.dumps(article, indent=2)
+        return to_json({"error": f"Paper '{article_id}' not found."})
+    return to_json(article)
 
 
 @mcp.tool()
+@run_in_thread
 def summarize_paper(article_id: str) -> str:
     """Generate an AI-powered summary of a paper."""
     article = get_article_details(article_id)
     if not article:
         return f"Paper '{article_id}' not found."
-    return summarize_article(article) or "Could not generate summary."
+    return cached_summary(article) or "Could not generate summary."
 
 
 @mcp.tool()
+async def summarize_papers(article_ids: list[str]) -> str:
+    """Summarize up to 10 papers in parallel (prefer this over repeated summarize_paper calls); extra IDs are listed under "skipped"."""
+    return to_json(await summarize_many(article_ids))
+
+
+@mcp.tool()
+@run_in_thread
 def explain_paper(article_id: str) -> str:
     """Explain a paper in simple terms a 10-year-old could understand."""
     article = get_article_details(article_id)
@@ -89,12 +101,12 @@ def explain_paper(article_id: str) -> str:
 
 
 @mcp.tool()
-def chat_about_paper(article_id: str, message: str) -> str:
+async def chat_about_paper(article_id: str, message: str) -> str:
     """Have an interactive conversation about a paper."""
-    article = get_article_details(article_id)
+    article = await asyncio.to_thread(get_article_details, article_id)
     if not article:
         return f"Paper '{article_id}' not found."
-    result = chat_about_article(article, message, history=[], provider="gemini")
+    result = await chat_about_article_async(article, message, history=[])
     return result.get("response", "Could not get a response.")
 
 
@@ -138,7 +150,7 @@ def research_summary(topic: str, num_papers: int = 5) -> str:
     """Search and summarize papers on a topic."""
     return (
         f"Search for {num_papers} papers about '{topic}' using search_arxiv. "
-        f"Summarize each with summarize_paper, then give an overview of themes, "
+        f"Summarize them all at once with summarize_papers, then give an overview of themes, "
         f"findings, and gaps."
     )
 
@@ -154,5 +166,5 @@ def explain_like_ten(topic: str) -> str:
 
 if __name__ == "__main__":
     port = int(os.getenv("MCP_PORT", "8001"))
-    logger.info(f"Starting SSE server on port {port}")
+    logger.info("Starting SSE server on port %s", port)
     mcp.run(transport="sse", port=port)
@@ -9,14 +9,16 @@ Run locally:  python mcp_server.py
 Run with MCP inspector:  npx @modelcontextprotocol/inspector python mcp_server.py
 """
 
-import json
+import asyncio
+import io
 import logging
 from mcp.server.fastmcp import FastMCP
 
-from src.article_finder import find_articles
 from src.article_reader import get_article_details, list_all_topics, get_articles_by_topic
-from src.summarizer import summarize_article, explain_like_ten as eli10
-from src.chat_engine import chat_about_article
+from src.summarizer import explain_like_ten as eli10
+from src.chat_engine import chat_about_article_async
+from src.tool_cache import cached_find_articles, cached_summary, summarize_many
+from src.mcp_utils import run_in_thread, to_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,6 +29,7 @@ mcp = FastMCP("arxiv-scholar-ai")
 # --------------- MCP Tools ---------------
 
 @mcp.tool()
+@run_in_thread
 def search_arxiv(
     topic: str,
     max_results: int = 5,
@@ -45,21 +48,21 @@ def search_arxiv(
     """
     max_results = max(1, min(20, max_results))
     try:
-        articles = find_articles(
+        articles = cached_find_articles(
             topic=topic,
             max_results=max_results,
             sort_by=sort_by,
         )
     except Exception as e:
         if "429" in str(e):
-            return json.dumps({
+            return to_json({
                 "count": 0,
                 "message": f"arXiv is temporarily rate-limiting requests. The search results for '{topic}' are not available right now. Do NOT retry this tool -- instead, tell the user to try again in about 60 seconds.",
             })
         raise
 
     if not articles:
-        return json.dumps({"count": 0, "message": f"No papers found for '{topic}'."})
+        return to_json({"count": 0, "message": f"No papers found for '{topic}'."})
 
     results = []
     for a in articles:
@@ -71,10 +74,11 @@ def search_arxiv(
             "pdf_url": a["pdf_url"],
         })
 
-    return json.dumps({"count": len(results), "papers": results})
+    return to_json({"count": len(results), "papers": results})
 
 
 @mcp.tool()
+@run_in_thread
 def get_paper(article_id: str) -> str:
     """
     Get full metadata for a specific arXiv paper by its ID.
@@ -87,11 +91,12 @@ def get_paper(article_id: str) -> str:
     """
     article = get_article_details(article_id)
     if not article:
-        return json.dumps({"error": f"Paper '{article_id}' not found. Try searching first."})
-    return json.dumps(article, indent=2)
+        return to_json({"error": f"Paper '{article_id}' not found. Try searching first."})
+    return to_json(article)
 
 
 @mcp.tool()
+@run_in_thread
 def summarize_paper(article_id: str) -> str:
     """
     Generate an AI-powered summary of a paper. Uses Gemini when available,
@@ -106,11 +111,28 @@ def summarize_paper(article_id: str) -> str:
     article = get_article_details(article_id)
     if not article:
         return f"Paper '{article_id}' not found. Search for papers first."
-    summary = summarize_article(article)
+    summary = cached_summary(article)
     return summary or "Could not generate summary."
 
 
 @mcp.tool()
+async def summarize_papers(article_ids: list[str]) -> str:
+    """
+    Summarize several papers in one call. Summaries are generated in
+    parallel, so prefer this over calling summarize_paper once per paper.
+
+    Args:
+        article_ids: arXiv short IDs of the papers to summarize (up to 10)
+
+    Returns:
+        JSON object: "summaries" maps each article ID to its summary (null if
+        not found); "skipped" lists any IDs past the first 10, not summarized
+    """
+    return to_json(await summarize_many(article_ids))
+
+
+@mcp.tool()
+@run_in_thread
 def explain_paper(article_id: str) -> str:
     """
     Explain a paper in simple terms a 10-year-old could understand.
@@ -130,7 +152,7 @@ def explain_paper(article_id: str) -> str:
 
 
 @mcp.tool()
-def chat_about_paper(article_id: str, message: str) -> str:
+async def chat_about_paper(article_id: str, message: str) -> str:
     """
     Have an interactive conversation about a paper. The AI explains things
     like a friendly teacher talking to a 10-year-old.
@@ -142,11 +164,11 @@ def chat_about_paper(article_id: str, message: str) -> str:
     Returns:
         The AI's response explaining the paper
     """
-    article = get_article_details(article_id)
+    article = await asyncio.to_thread(get_article_details, article_id)
     if not article:
         return f"Paper '{article_id}' not found. Search for papers first."
 
-    result = chat_about_article(article, message, history=[], provider="gemini")
+    result = await chat_about_article_async(article, message, history=[])
     return result.get("response", "Could not get a response.")
 
 
@@ -173,21 +195,24 @@ def get_topic_resource(slug: str) -> str:
     if not articles:
         return f"No papers found for topic '{slug}'."
 
-    lines = [f"# Papers on {slug.replace('_', ' ').title()}\n"]
-    lines.append(f"Total: {len(articles)} papers\n")
+    # Written straight into one buffer; topics can hold hundreds of papers
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# Papers on {slug.replace('_', ' ').title()}\n\n")
+    w(f"Total: {len(articles)} papers\n\n")
 
     for paper_id, paper in articles.items():
-        lines.append(f"## {paper.get('title', 'Untitled')}")
-        lines.append(f"- **ID**: {paper_id}")
-        lines.append(f"- **Authors**: {', '.join(paper.get('authors', []))}")
-        lines.append(f"- **Published**: {paper.get('published', 'Unknown')}")
-        lines.append(f"- **PDF**: {paper.get('pdf_url', 'N/A')}")
+        w(f"## {paper.get('title', 'Untitled')}\n")
+        w(f"- **ID**: {paper_id}\n")
+        w(f"- **Authors**: {', '.join(paper.get('authors', []))}\n")
+        w(f"- **Published**: {paper.get('published', 'Unknown')}\n")
+        w(f"- **PDF**: {paper.get('pdf_url', 'N/A')}\n")
         abstract = paper.get("summary", "")
         if abstract:
-            lines.append(f"\n{abstract[:400]}...\n")
-        lines.append("---\n")
+            w(f"\n{abstract[:400]}...\n\n")
+        w("---\n\n")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 @mcp.resource("arxiv://paper/{article_id}")
@@ -197,13 +222,14 @@ def get_paper_resource(article_id: str) -> str:
     if not article:
         return f"Paper '{article_id}' not found."
 
-    lines = [f"# {article.get('title', 'Untitled')}\n"]
-    lines.append(f"**ID**: {article.get('id', article_id)}")
-    lines.append(f"**Authors**: {', '.join(article.get('authors', []))}")
-    lines.append(f"**Published**: {article.get('published', 'Unknown')}")
-    lines.append(f"**PDF**: {article.get('pdf_url', 'N/A')}")
-    lines.append(f"\n## Abstract\n\n{article.get('summary', 'No abstract available.')}")
-    return "\n".join(lines)
+    return (
+        f"# {article.get('title', 'Untitled')}\n\n"
+        f"**ID**: {article.get('id', article_id)}\n"
+        f"**Authors**: {', '.join(article.get('authors', []))}\n"
+        f"**Published**: {article.get('published', 'Unknown')}\n"
+        f"**PDF**: {article.get('pdf_url', 'N/A')}\n"
+        f"\n## Abstract\n\n{article.get('summary', 'No abstract available.')}"
+    )
 
 
 # --------------- MCP Prompts ---------------
@@ -213,7 +239,7 @@ def research_summary(topic: str, num_papers: int = 5) -> str:
     """Generate a research summary by searching and summarizing papers on a topic."""
     return (
         f"Search for {num_papers} academic papers about '{topic}' using the search_arxiv tool. "
-        f"Then summarize each paper using summarize_paper. "
+        f"Then summarize them all in one call using summarize_papers with the list of paper IDs. "
         f"Finally, provide an overview of the research landscape:\n"
         f"- Common themes across papers\n"
         f"- Key findings and methods\n"
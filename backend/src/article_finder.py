@@ -4,14 +4,20 @@ Searches arXiv for academic papers and stores their metadata locally.
 """
 
 import arxiv
-import json
-import os
+import asyncio
 import logging
+import re
+import threading
 import time
+import xml.etree.ElementTree as ET
 from datetime import datetime, date
 from typing import List, Dict, Any, Optional
 
-from .config import RESEARCH_DIR, DEFAULT_MAX_RESULTS
+import httpx
+
+from .config import DEFAULT_MAX_RESULTS
+from .article_reader import invalidate_article_cache
+from .article_store import append_articles, stored_articles
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +27,70 @@ SORT_CRITERIA = {
     "updated": arxiv.SortCriterion.LastUpdatedDate,
 }
 
-FETCH_MULTIPLIER = 3
 MAX_FETCH_COUNT = 25
+ARXIV_MIN_DATE = "19910101"  # arXiv's first submissions
 ARXIV_RETRIES = 3
 ARXIV_RETRY_DELAY = 5  # seconds, doubles each retry
+ARXIV_MIN_INTERVAL = 3.0  # seconds between arXiv API calls, per arXiv's usage guidelines
+
+# Raw arXiv API, used by the async search path (shared httpx client)
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_SORT_PARAMS = {
+    "relevance": "relevance",
+    "date": "submittedDate",
+    "updated": "lastUpdatedDate",
+}
+_ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+
+# arxiv.Client objects hold a requests.Session, so we keep them around to
+# reuse keep-alive connections. One per page size, since page_size is fixed
+# per client and is what arXiv sees as the number of results we want.
+_arxiv_clients: Dict[int, arxiv.Client] = {}
+_arxiv_clients_lock = threading.Lock()
+
+
+def _get_client(page_size: int) -> arxiv.Client:
+    """Return the shared arXiv client for this page size, creating it once."""
+    with _arxiv_clients_lock:
+        client = _arxiv_clients.get(page_size)
+        if client is None:
+            client = arxiv.Client(
+                page_size=page_size,
+                delay_seconds=3,
+                num_retries=3,
+            )
+            _arxiv_clients[page_size] = client
+        return client
+
+
+class _ArxivThrottle:
+    """
+    Process-wide spacing for arXiv API calls, shared by the sync and async
+    search paths. Each caller reserves the next free slot and sleeps until
+    it, so concurrent searches queue up instead of tripping arXiv's 429s.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next request slot. Returns how many seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.interval
+            return start - now
+
+    def defer(self, seconds: float):
+        """Push every future slot back, e.g. after arXiv asks us to slow down."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+# Global arXiv throttle instance
+_arxiv_throttle = _ArxivThrottle(ARXIV_MIN_INTERVAL)
 
 
 def _parse_date(yyyymmdd: str) -> date:
@@ -41,19 +107,21 @@ def _filter_by_date(
     if not date_from and not date_to:
         return articles
 
-    from_date = _parse_date(date_from) if date_from else date.min
-    to_date = _parse_date(date_to) if date_to else date.max
+    # "published" is stored as YYYY-MM-DD, which sorts like the date itself,
+    # so the bounds are formatted once and compared as plain strings.
+    lo = _parse_date(date_from).isoformat() if date_from else "0000-00-00"
+    hi = _parse_date(date_to).isoformat() if date_to else "9999-99-99"
+
+    return [a for a in articles if lo <= a.get("published", "") <= hi]
 
-    filtered = []
-    for article in articles:
-        try:
-            pub = date.fromisoformat(article["published"])
-            if from_date <= pub <= to_date:
-                filtered.append(article)
-        except (ValueError, KeyError):
-            pass
 
-    return filtered
+def _build_query(topic: str, date_from: Optional[str], date_to: Optional[str]) -> str:
+    """Add an arXiv submittedDate range to the query when dates are given."""
+    if not date_from and not date_to:
+        return topic
+    start = date_from or ARXIV_MIN_DATE
+    end = date_to or date.today().strftime("%Y%m%d")
+    return f"({topic}) AND submittedDate:[{start}0000 TO {end}2359]"
 
 
 def find_articles(
@@ -66,9 +134,9 @@ def find_articles(
     """
     Search arXiv for articles matching a topic and store their metadata.
 
-    When date filters are provided, fetches extra results from arXiv and
-    filters locally by published date. ArXiv's submittedDate query filter
-    is unreliable, so we enforce it ourselves.
+    Date filters are sent to arXiv as a submittedDate range, so only
+    matching papers are fetched. The local published-date filter still
+    runs afterwards as a safety net.
 
     Args:
         topic: The search query
@@ -80,79 +148,182 @@ def find_articles(
     Returns:
         List of article metadata dicts, at most max_results items
     """
-    has_date_filter = bool(date_from or date_to)
-    fetch_count = max_results * FETCH_MULTIPLIER if has_date_filter else max_results
-    fetch_count = min(fetch_count, MAX_FETCH_COUNT)
+    fetch_count = min(max_results, MAX_FETCH_COUNT)
 
     # page_size matches fetch_count so arXiv sees the actual number we need
-    client = arxiv.Client(
-        page_size=fetch_count,
-        delay_seconds=3,
-        num_retries=3,
-    )
+    client = _get_client(fetch_count)
 
     sort_criterion = SORT_CRITERIA.get(sort_by, arxiv.SortCriterion.Relevance)
 
     search = arxiv.Search(
-        query=topic,
+        query=_build_query(topic, date_from, date_to),
         max_results=fetch_count,
         sort_by=sort_criterion,
     )
 
+    # Papers we've already stored are reused as-is instead of rebuilt
+    existing = stored_articles(topic)
+
     # arxiv library doesn't retry on HTTP 429, so we handle it ourselves
     all_articles = []
     for attempt in range(ARXIV_RETRIES):
+        time.sleep(_arxiv_throttle.reserve())
         try:
             all_articles = []
             for result in client.results(search):
                 article_id = result.get_short_id()
+                cached = existing.get(article_id)
+                if cached is not None:
+                    all_articles.append(cached)
+                    continue
                 all_articles.append({
                     "id": article_id,
                     "title": result.title,
                     "authors": [author.name for author in result.authors],
                     "summary": result.summary,
                     "pdf_url": str(result.pdf_url),
-                    "published": str(result.published.date()),
+                    "published": result.published.strftime("%Y-%m-%d"),
                     "topic": topic,
                 })
             break
         except Exception as e:
             if "429" in str(e) and attempt < ARXIV_RETRIES - 1:
                 wait = ARXIV_RETRY_DELAY * (attempt + 1)
-                logger.warning(f"arXiv rate limit (429), retrying in {wait}s (attempt {attempt + 1}/{ARXIV_RETRIES})")
-                time.sleep(wait)
+                logger.warning("arXiv rate limit (429), retrying in %ss (attempt %s/%s)", wait, attempt + 1, ARXIV_RETRIES)
+                _arxiv_throttle.defer(wait)
                 continue
             raise
 
-    topic_slug = topic.lower().strip().replace(" ", "_")
-    topic_dir = os.path.join(RESEARCH_DIR, topic_slug)
-    os.makedirs(topic_dir, exist_ok=True)
+    _save_articles(topic, all_articles)
+    return _select_results(all_articles, topic, max_results, date_from, date_to)
 
-    metadata_path = os.path.join(topic_dir, "articles.json")
 
-    existing_data = {}
-    try:
-        with open(metadata_path, "r") as f:
-            existing_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        existing_data = {}
+async def find_articles_async(
+    client: httpx.AsyncClient,
+    topic: str,
+    max_results: int = DEFAULT_MAX_RESULTS,
+    sort_by: str = "relevance",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of find_articles for the FastAPI search endpoint.
 
-    for article in all_articles:
-        existing_data[article["id"]] = article
+    Queries the arXiv API over a shared httpx.AsyncClient, so connections
+    are kept alive between searches and the event loop is never blocked.
+    Returns the same article dicts as find_articles.
+
+    Args:
+        client: Shared httpx.AsyncClient (created in the app lifespan)
+        topic: The search query
+        max_results: Maximum number of articles to return
+        sort_by: Sort order - "relevance", "date", or "updated"
+        date_from: Start date in YYYYMMDD format (inclusive)
+        date_to: End date in YYYYMMDD format (inclusive)
+
+    Returns:
+        List of article metadata dicts, at most max_results items
+    """
+    fetch_count = min(max_results, MAX_FETCH_COUNT)
+
+    params = {
+        "search_query": _build_query(topic, date_from, date_to),
+        "start": 0,
+        "max_results": fetch_count,
+        "sortBy": ARXIV_SORT_PARAMS.get(sort_by, "relevance"),
+        "sortOrder": "descending",
+    }
+
+    for attempt in range(ARXIV_RETRIES):
+        await asyncio.sleep(_arxiv_throttle.reserve())
+        resp = await client.get(ARXIV_API_URL, params=params)
+        if resp.status_code == 429 and attempt < ARXIV_RETRIES - 1:
+            retry_after = resp.headers.get("Retry-After", "")
+            wait = int(retry_after) if retry_after.isdigit() else ARXIV_RETRY_DELAY * (attempt + 1)
+            logger.warning("arXiv rate limit (429), retrying in %ss (attempt %s/%s)", wait, attempt + 1, ARXIV_RETRIES)
+            _arxiv_throttle.defer(wait)
+            continue
+        resp.raise_for_status()
+        break
+
+    # Both touch the JSONL store under a threading.Lock; keep that off the loop.
+    known = await asyncio.to_thread(stored_articles, topic)
+    all_articles = _parse_arxiv_feed(resp.content, topic, known)
+
+    await asyncio.to_thread(_save_articles, topic, all_articles)
+    return _select_results(all_articles, topic, max_results, date_from, date_to)
 
-    with open(metadata_path, "w") as f:
-        json.dump(existing_data, f, indent=2)
 
-    if has_date_filter:
+def _parse_arxiv_feed(
+    content: bytes,
+    topic: str,
+    existing: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Convert an arXiv Atom feed into article metadata dicts, reusing stored ones."""
+    root = ET.fromstring(content)
+    articles = []
+    for entry in root.iterfind("atom:entry", _ATOM_NS):
+        entry_id = entry.findtext("atom:id", "", _ATOM_NS)
+        published = entry.findtext("atom:published", "", _ATOM_NS)
+        if not entry_id or not published:
+            continue
+
+        article_id = entry_id.split("arxiv.org/abs/")[-1]
+        cached = existing.get(article_id)
+        if cached is not None:
+            articles.append(cached)
+            continue
+
+        pdf_url = ""
+        for link in entry.iterfind("atom:link", _ATOM_NS):
+            if link.get("title") == "pdf":
+                pdf_url = link.get("href", "")
+                break
+
+        articles.append({
+            "id": article_id,
+            "title": re.sub(r"\s+", " ", entry.findtext("atom:title", "", _ATOM_NS)),
+            "authors": [
+                author.findtext("atom:name", "", _ATOM_NS)
+                for author in entry.iterfind("atom:author", _ATOM_NS)
+            ],
+            "summary": entry.findtext("atom:summary", "", _ATOM_NS),
+            "pdf_url": pdf_url,
+            "published": published[:10],
+            "topic": topic,
+        })
+    return articles
+
+
+def _save_articles(topic: str, all_articles: List[Dict[str, Any]]):
+    """Append newly fetched articles to the topic's article store."""
+    written = append_articles(topic, all_articles)
+    invalidate_article_cache(article["id"] for article in written)
+
+
+def _select_results(
+    all_articles: List[Dict[str, Any]],
+    topic: str,
+    max_results: int,
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> List[Dict[str, Any]]:
+    """Apply the date filter and trim to max_results."""
+    if date_from or date_to:
         articles = _filter_by_date(all_articles, date_from, date_to)
+        if len(articles) != len(all_articles):
+            logger.debug(
+                "arXiv returned %s papers outside %s-%s for topic '%s'",
+                len(all_articles) - len(articles), date_from, date_to, topic,
+            )
     else:
         articles = all_articles
 
     articles = articles[:max_results]
 
     logger.info(
-        f"Found {len(all_articles)} from arXiv, {len(articles)} after date filter "
-        f"for topic '{topic}' (date_from={date_from}, date_to={date_to})"
+        "Found %s from arXiv, %s after date filter for topic '%s' (date_from=%s, date_to=%s)",
+        len(all_articles), len(articles), topic, date_from, date_to,
     )
 
     return articles
@@ -3,20 +3,80 @@ Article Reader module for ArXiv Scholar AI.
 Retrieves stored article metadata by ID across all topic directories.
 """
 
-import json
+import asyncio
+import contextlib
 import os
+import tempfile
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Iterable, Mapping, Tuple
+
+import orjson
+from cachetools import TTLCache
 
 from .config import RESEARCH_DIR
+from .article_store import has_articles, load_topic_dir, topic_signature
 
 logger = logging.getLogger(__name__)
 
+# Recently looked-up articles keyed by arXiv ID. The UI usually fetches a
+# paper's details and then summarizes or chats about it, so repeat lookups
+# are served from memory instead of rescanning every topic file.
+ARTICLE_CACHE_SIZE = 1024
+ARTICLE_CACHE_TTL = 300  # seconds
+# IDs that weren't found are remembered briefly too, so an agent retrying
+# a bad ID doesn't rescan every topic each time.
+MISSING_CACHE_SIZE = 512
+MISSING_CACHE_TTL = 60  # seconds
+
+_article_cache: TTLCache = TTLCache(maxsize=ARTICLE_CACHE_SIZE, ttl=ARTICLE_CACHE_TTL)
+_missing_cache: TTLCache = TTLCache(maxsize=MISSING_CACHE_SIZE, ttl=MISSING_CACHE_TTL)
+_article_cache_lock = threading.Lock()
+
+# Behind those caches: every topic's parsed articles plus an
+# article ID -> topic index. A topic is only re-parsed when the
+# (mtime, size) signature of its metadata files changes.
+_topic_articles: Dict[str, Dict[str, Any]] = {}
+_topic_signatures: Dict[str, tuple] = {}
+_article_index: Dict[str, str] = {}
+_index_lock = threading.Lock()
+
+# The parsed topics are also persisted as one master index file, so a fresh
+# process does a single read plus a stat per topic instead of parsing every
+# topic file. Entries whose signature no longer matches are re-parsed.
+MASTER_INDEX_FILE = "_index.json"
+_master_index_loaded = False
+
+# Sorted topic list, reused while RESEARCH_DIR's mtime is unchanged (adding or
+# removing a topic folder bumps it). Cleared on invalidate_article_cache too,
+# since a new folder only counts once its articles file has been written.
+_topics_cache: Optional[Tuple[int, List[str]]] = None
+
+
+def invalidate_article_cache(article_ids: Optional[Iterable[str]] = None):
+    """
+    Drop cached article lookups after new metadata is written.
+
+    Args:
+        article_ids: IDs to evict, or None to clear the whole cache
+    """
+    global _topics_cache
+    with _article_cache_lock:
+        _topics_cache = None
+        if article_ids is None:
+            _article_cache.clear()
+            _missing_cache.clear()
+            return
+        for article_id in article_ids:
+            _article_cache.pop(article_id, None)
+            _missing_cache.pop(article_id, None)
+
 
 def get_article_details(article_id: str) -> Optional[Dict[str, Any]]:
     """
     Look up a specific article's metadata by its arXiv ID.
-    Searches across all topic directories.
+    Serves repeat lookups (including misses) from in-memory TTL caches.
 
     Args:
         article_id: The arXiv short ID (e.g., "2401.12345v2")
@@ -24,34 +84,142 @@ def get_article_details(article_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Article metadata dictionary if found, None otherwise
     """
-    if not os.path.exists(RESEARCH_DIR):
-        logger.warning(f"Research directory '{RESEARCH_DIR}' does not exist")
-        return None
+    with _article_cache_lock:
+        cached = _article_cache.get(article_id)
+        if cached is None and article_id in _missing_cache:
+            return None
+    if cached is not None:
+        return cached
+
+    article = _find_article_on_disk(article_id)
+    with _article_cache_lock:
+        if article is not None:
+            _article_cache[article_id] = article
+        else:
+            _missing_cache[article_id] = True
+    return article
+
+
+def _drop_topic(slug: str):
+    """Remove a topic from the index. Caller holds _index_lock."""
+    for article_id in _topic_articles.pop(slug, {}):
+        if _article_index.get(article_id) == slug:
+            del _article_index[article_id]
+    _topic_signatures.pop(slug, None)
+
+
+def _refresh_topic(slug: str, topic_dir: str) -> Dict[str, Any]:
+    """Re-parse a topic if its files changed. Caller holds _index_lock."""
+    # Signature is taken before reading, so a write racing the read just
+    # triggers another reload next time instead of pinning stale data.
+    signature = topic_signature(topic_dir)
+    if signature is None:
+        _drop_topic(slug)
+        return {}
 
-    for topic_folder in os.listdir(RESEARCH_DIR):
-        folder_path = os.path.join(RESEARCH_DIR, topic_folder)
+    if _topic_signatures.get(slug) != signature:
+        _drop_topic(slug)
+        articles = load_topic_dir(topic_dir)
+        _topic_articles[slug] = articles
+        _topic_signatures[slug] = signature
+        for article_id in articles:
+            _article_index[article_id] = slug
 
-        if not os.path.isdir(folder_path):
-            continue
+    return _topic_articles[slug]
 
-        metadata_path = os.path.join(folder_path, "articles.json")
 
-        if not os.path.isfile(metadata_path):
-            continue
+def _load_master_index():
+    """Seed the in-memory index from the master index file. Caller holds _index_lock."""
+    path = os.path.join(RESEARCH_DIR, MASTER_INDEX_FILE)
+    # Parsed into locals first, so a malformed file leaves no partial state
+    # behind and _refresh_index simply rebuilds from the topic folders
+    articles, signatures = {}, {}
+    try:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+        for slug, topic in data.get("topics", {}).items():
+            articles[slug] = topic["articles"]
+            signatures[slug] = tuple(tuple(item) for item in topic["signature"])
+    except FileNotFoundError:
+        return
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        logger.warning("Ignoring unreadable master index %s: %s", path, e)
+        return
+
+    for slug, topic_articles in articles.items():
+        _topic_articles[slug] = topic_articles
+        _topic_signatures[slug] = signatures[slug]
+        for article_id in topic_articles:
+            _article_index[article_id] = slug
+
+
+def _write_master_index():
+    """Persist the in-memory index. Caller holds _index_lock."""
+    data = {
+        "topics": {
+            slug: {"signature": _topic_signatures[slug], "articles": articles}
+            for slug, articles in _topic_articles.items()
+        }
+    }
+    path = os.path.join(RESEARCH_DIR, MASTER_INDEX_FILE)
+    tmp_path = None
+    try:
+        # A unique temp file per write, so two processes refreshing at once
+        # never write into (or replace from) the same file
+        fd, tmp_path = tempfile.mkstemp(dir=RESEARCH_DIR, prefix=f"{MASTER_INDEX_FILE}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write master index %s: %s", path, e)
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+
+def _refresh_index():
+    """Bring the article index up to date with RESEARCH_DIR. Caller holds _index_lock."""
+    global _master_index_loaded
+    if not _master_index_loaded:
+        _master_index_loaded = True
+        _load_master_index()
+
+    before = dict(_topic_signatures)
+    seen = set()
+    try:
+        entries = os.scandir(RESEARCH_DIR)
+    except FileNotFoundError:
+        entries = None
+
+    if entries is not None:
+        # scandir's DirEntry caches the file type, so no extra stat per folder
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    seen.add(entry.name)
+                    _refresh_topic(entry.name, entry.path)
 
-        try:
-            with open(metadata_path, "r") as f:
-                articles_data = json.load(f)
+    for slug in set(_topic_articles) - seen:
+        _drop_topic(slug)
 
-                if article_id in articles_data:
-                    logger.info(f"Found article '{article_id}' in topic '{topic_folder}'")
-                    return articles_data[article_id]
+    if entries is not None and _topic_signatures != before:
+        _write_master_index()
 
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"Error reading {metadata_path}: {e}")
-            continue
 
-    logger.info(f"Article '{article_id}' not found in any topic directory")
+def _find_article_on_disk(article_id: str) -> Optional[Dict[str, Any]]:
+    """Look an article ID up in the topic index, reloading changed topics first."""
+    if not os.path.isdir(RESEARCH_DIR):
+        logger.warning("Research directory '%s' does not exist", RESEARCH_DIR)
+        return None
+
+    with _index_lock:
+        _refresh_index()
+        slug = _article_index.get(article_id)
+        if slug is not None:
+            logger.info("Found article '%s' in topic '%s'", article_id, slug)
+            return _topic_articles[slug][article_id]
+
+    logger.info("Article '%s' not found in any topic directory", article_id)
     return None
 
 
@@ -62,34 +230,47 @@ def list_all_topics() -> List[str]:
     Returns:
         List of topic names
     """
-    if not os.path.exists(RESEARCH_DIR):
+    global _topics_cache
+    try:
+        mtime = os.stat(RESEARCH_DIR).st_mtime_ns
+        cached = _topics_cache
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+        entries = os.scandir(RESEARCH_DIR)
+    except FileNotFoundError:
         return []
 
-    topics = []
-    for item in os.listdir(RESEARCH_DIR):
-        item_path = os.path.join(RESEARCH_DIR, item)
-        if os.path.isdir(item_path):
-            metadata_path = os.path.join(item_path, "articles.json")
-            if os.path.isfile(metadata_path):
-                topics.append(item)
+    with entries:
+        topics = sorted(
+            entry.name for entry in entries
+            if entry.is_dir(follow_symlinks=False) and has_articles(entry.path)
+        )
 
-    return sorted(topics)
+    _topics_cache = (mtime, topics)
+    return list(topics)
 
 
-def get_articles_by_topic(topic_slug: str) -> Dict[str, Any]:
+def get_articles_by_topic(topic_slug: str) -> Mapping[str, Any]:
     """
     Get all articles for a specific topic.
+    Unchanged topics are served from the in-memory index without copying.
 
     Args:
         topic_slug: The topic directory name (e.g., "transformer_architecture")
 
     Returns:
-        Dictionary of article_id -> article_metadata
+        Read-only mapping of article_id -> article_metadata
     """
-    metadata_path = os.path.join(RESEARCH_DIR, topic_slug, "articles.json")
+    with _index_lock:
+        articles = _refresh_topic(topic_slug, os.path.join(RESEARCH_DIR, topic_slug))
+    # Cached topic dicts are replaced on reload, never mutated, so a
+    # read-only view stays consistent for the caller.
+    return MappingProxyType(articles)
 
-    try:
-        with open(metadata_path, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+
+async def get_articles_by_topic_async(topic_slug: str) -> Mapping[str, Any]:
+    """
+    Async version of get_articles_by_topic for the FastAPI endpoints.
+    Reads the topic file in a worker thread so the event loop stays free.
+    """
+    return await asyncio.to_thread(get_articles_by_topic, topic_slug)
@@ -0,0 +1,155 @@
+"""
+Article Store module for ArXiv Scholar AI.
+On-disk storage for per-topic article metadata.
+
+Each topic directory holds an append-only JSON Lines file: a search only
+writes the papers it hasn't stored before, instead of re-serializing the
+whole topic. When an ID appears more than once, the last line wins.
+Topics saved before the switch (articles.json) are still read.
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from .config import RESEARCH_DIR
+
+logger = logging.getLogger(__name__)
+
+ARTICLES_FILE = "articles.jsonl"
+LEGACY_ARTICLES_FILE = "articles.json"
+
+# Articles already written per topic directory, loaded once per process so
+# appends (and searches that re-find known papers) don't re-read the file.
+_stored: Dict[str, Dict[str, Any]] = {}
+_write_lock = threading.Lock()
+
+
+def topic_slug(topic: str) -> str:
+    """Turn a search topic into its directory name."""
+    return topic.lower().strip().replace(" ", "_")
+
+
+def has_articles(topic_dir: str) -> bool:
+    """Whether a topic directory contains saved article metadata."""
+    return (
+        os.path.isfile(os.path.join(topic_dir, ARTICLES_FILE))
+        or os.path.isfile(os.path.join(topic_dir, LEGACY_ARTICLES_FILE))
+    )
+
+
+def topic_signature(topic_dir: str) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    """
+    (name, mtime_ns, size) for each metadata file in a topic directory.
+    Changes whenever the topic's articles do; None if nothing is stored.
+    """
+    signature = []
+    for name in (LEGACY_ARTICLES_FILE, ARTICLES_FILE):
+        try:
+            st = os.stat(os.path.join(topic_dir, name))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        signature.append((name, st.st_mtime_ns, st.st_size))
+    return tuple(signature) or None
+
+
+def load_topic_dir(topic_dir: str) -> Dict[str, Any]:
+    """
+    Read every stored article in a topic directory.
+
+    Args:
+        topic_dir: Path to the topic directory
+
+    Returns:
+        Dictionary of article_id -> article_metadata (empty if nothing is stored)
+    """
+    articles: Dict[str, Any] = {}
+
+    legacy_path = os.path.join(topic_dir, LEGACY_ARTICLES_FILE)
+    try:
+        with open(legacy_path, "rb") as f:
+            articles.update(orjson.loads(f.read()))
+    except FileNotFoundError:
+        pass
+    except orjson.JSONDecodeError as e:
+        logger.error("Error reading %s: %s", legacy_path, e)
+
+    path = os.path.join(topic_dir, ARTICLES_FILE)
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    article = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A crash mid-append can leave a partial last line
+                    logger.warning("Skipping malformed line in %s", path)
+                    continue
+                articles[article["id"]] = article
+    except FileNotFoundError:
+        pass
+
+    return articles
+
+
+def load_topic(slug: str) -> Dict[str, Any]:
+    """Read every stored article for a topic slug."""
+    return load_topic_dir(os.path.join(RESEARCH_DIR, slug))
+
+
+def _stored_for_dir(topic_dir: str) -> Dict[str, Any]:
+    """In-memory copy of a topic directory's articles. Caller holds _write_lock."""
+    stored = _stored.get(topic_dir)
+    if stored is None:
+        stored = load_topic_dir(topic_dir)
+        _stored[topic_dir] = stored
+    return stored
+
+
+def stored_articles(topic: str) -> Dict[str, Any]:
+    """
+    Articles already saved for a search topic, kept in memory after the first read.
+
+    Args:
+        topic: The search topic (slugified into the directory name)
+
+    Returns:
+        Dictionary of article_id -> article_metadata. Treat it as read-only.
+    """
+    topic_dir = os.path.join(RESEARCH_DIR, topic_slug(topic))
+    with _write_lock:
+        return _stored_for_dir(topic_dir)
+
+
+def append_articles(topic: str, articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Append articles not yet stored for this topic.
+
+    Args:
+        topic: The search topic (slugified into the directory name)
+        articles: Article metadata dicts, each with an "id"
+
+    Returns:
+        The articles that were actually written
+    """
+    topic_dir = os.path.join(RESEARCH_DIR, topic_slug(topic))
+
+    with _write_lock:
+        os.makedirs(topic_dir, exist_ok=True)
+        stored = _stored_for_dir(topic_dir)
+
+        new_articles = {}
+        for article in articles:
+            if article["id"] not in stored:
+                new_articles[article["id"]] = article
+
+        if new_articles:
+            with open(os.path.join(topic_dir, ARTICLES_FILE), "ab") as f:
+                f.writelines(orjson.dumps(article) + b"\n" for article in new_articles.values())
+            stored.update(new_articles)
+
+    return list(new_articles.values())
@@ -4,13 +4,27 @@ Powers the "Explain Like I'm 10" interactive chatbot.
 Uses Google Gemini (free tier).
 """
 
+import asyncio
+import functools
 import logging
-from typing import Dict, Any, List
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Any, Iterator, List, NamedTuple, Optional, Tuple
 
-from .config import GOOGLE_API_KEY, OPENAI_API_KEY
+import httpx
+import orjson
+import requests
+
+from .config import CHAT_HEDGE_DELAY, CHAT_PROVIDER_ORDER, GOOGLE_API_KEY, OPENAI_API_KEY
+from .gemini_budget import gemini_budget
+from .http_session import JSON_HEADERS, async_http, http_session
 
 logger = logging.getLogger(__name__)
 
+
 SYSTEM_PROMPT = """You are a friendly teacher who explains research papers to a 10-year-old kid.
 
 Rules:
@@ -35,69 +49,297 @@ Abstract:
 
 def _build_system_prompt(article: Dict[str, Any]) -> str:
     """Build the system prompt with the paper's details filled in."""
+    return _render_system_prompt(
+        article.get("title", "Unknown Title"),
+        tuple(article.get("authors", [])),
+        article.get("published", "Unknown date"),
+        article.get("summary", "No abstract available."),
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _render_system_prompt(title: str, authors: Tuple[str, ...], published: str, abstract: str) -> str:
+    """Fill in SYSTEM_PROMPT. Cached, since every turn of a chat renders the same paper."""
     return SYSTEM_PROMPT.format(
-        title=article.get("title", "Unknown Title"),
-        authors=", ".join(article.get("authors", [])),
-        published=article.get("published", "Unknown date"),
-        abstract=article.get("summary", "No abstract available."),
+        title=title,
+        authors=", ".join(authors),
+        published=published,
+        abstract=abstract,
     )
 
 
 GEMINI_MODELS = ["gemini-2.0-flash-lite", "gemini-2.0-flash"]
 
+# Only the most recent messages are sent to the model, so payload size and
+# token cost stay flat however long a chat runs. The token budget also caps
+# long assistant replies, which the client sends back unvalidated.
+MAX_HISTORY_TURNS = 12
+MAX_HISTORY_TOKENS = 3000
+CHARS_PER_TOKEN = 4  # rough estimate, good enough for a budget
+
+
+def _trim_history(history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """The most recent messages that fit in MAX_HISTORY_TURNS and MAX_HISTORY_TOKENS."""
+    budget = MAX_HISTORY_TOKENS * CHARS_PER_TOKEN
+    recent = history[-MAX_HISTORY_TURNS:]
+    start = len(recent)
+    while start > 0 and len(recent[start - 1]["content"]) <= budget:
+        start -= 1
+        budget -= len(recent[start]["content"])
+    return recent[start:]
+
+# Speaker labels for the flattened Gemini prompt; anything but "user" is the assistant
+_ROLE_LABELS = {"user": "User"}
+
+
+def _build_gemini_prompt(
+    system_prompt: str,
+    message: str,
+    history: List[Dict[str, str]],
+) -> str:
+    """
+    Flatten the system prompt, history, and new message into one Gemini prompt.
+
+    The rendered system prompt (rules, then the paper) always comes first and
+    contains nothing per-turn, so every turn about a paper shares the same
+    leading tokens and Gemini's implicit prefix caching can reuse them.
+    """
+    parts = [system_prompt]
+    parts.extend(
+        f"{_ROLE_LABELS.get(msg['role'], 'Assistant')}: {msg['content']}" for msg in history
+    )
+    parts.append(f"User: {message}")
+    parts.append("Assistant:")
+    return "\n\n".join(parts)
+
+
+def _gemini_payload(
+    system_prompt: str,
+    message: str,
+    history: List[Dict[str, str]],
+) -> bytes:
+    """generateContent request body for a chat turn, serialized once for every attempt."""
+    return orjson.dumps({"contents": [{"parts": [{"text": _build_gemini_prompt(system_prompt, message, history)}]}]})
+
+
+# Provider error text -> error_type, checked in order
+# Whole words only: a bare "rate" also matches "generateContent" in 404 bodies
+_RATE_RE = re.compile(r"\b429\b|\brate[ _-]?limit|RESOURCE_EXHAUSTED|\bquota\b", re.IGNORECASE)
+_BILLING_RE = re.compile(r"402|billing|credit|balance|payment", re.IGNORECASE)
+
+
+def _classify_error(error: str) -> str:
+    """Map a provider error message to an error_type for _friendly_error."""
+    if _RATE_RE.search(error):
+        return "rate_limited"
+    if _BILLING_RE.search(error):
+        return "credits_exhausted"
+    return "unknown"
+
+
+# Timeouts adapt to recent latencies per (provider, model): twice the
+# median, so a stuck connection is abandoned (and retried) well before the
+# fixed ceiling, which still applies until enough samples exist. A timed-out
+# attempt counts as a sample at its timeout, so if the provider slows down
+# for good the timeout grows back toward the ceiling instead of staying too
+# low for any call to succeed (and record a sample) again.
+LATENCY_WINDOW = 64
+LATENCY_MIN_SAMPLES = 5
+MIN_TIMEOUT = 2.0  # seconds
+
+_latencies: Dict[Tuple[str, str], Deque[float]] = {}
+_latency_lock = threading.Lock()
+
+
+def _adaptive_timeout(key: Tuple[str, str], ceiling: float) -> float:
+    """Timeout for the next call to key, between MIN_TIMEOUT and ceiling."""
+    with _latency_lock:
+        samples = list(_latencies.get(key, ()))
+    if len(samples) < LATENCY_MIN_SAMPLES:
+        return ceiling
+    return min(ceiling, max(MIN_TIMEOUT, 2 * statistics.median(samples)))
+
 
-def _chat_with_gemini(
+def _hedge_delay(provider: str) -> float:
+    """
+    How long to wait on provider before hedging: the p95 of its recent
+    latencies, so only the slow tail triggers a second (paid) request.
+    Falls back to CHAT_HEDGE_DELAY until enough samples exist.
+    """
+    with _latency_lock:
+        samples = [s for key, window in _latencies.items() if key[0] == provider for s in window]
+    if len(samples) < LATENCY_MIN_SAMPLES:
+        return CHAT_HEDGE_DELAY
+    return max(MIN_TIMEOUT, statistics.quantiles(samples, n=20)[-1])
+
+
+def _record_latency(key: Tuple[str, str], seconds: float):
+    """Remember how long a call to key took (its timeout, if it timed out)."""
+    with _latency_lock:
+        _latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+
+GEMINI_API_VERSIONS = ["v1", "v1beta"]
+GEMINI_TIMEOUT = 8  # seconds per attempt, at most
+
+# Every (model, api_version) pair, in preference order
+GEMINI_TARGETS = [(model, version) for model in GEMINI_MODELS for version in GEMINI_API_VERSIONS]
+
+# Endpoint URLs are fixed for the life of the process (the key is read once
+# from the environment at startup), so build them once here.
+GEMINI_API_ROOT = "https://generativelanguage.googleapis.com"
+_GEMINI_URLS = {
+    (model, version): f"{GEMINI_API_ROOT}/{version}/models/{model}:generateContent?key={GOOGLE_API_KEY}"
+    for model, version in GEMINI_TARGETS
+}
+_GEMINI_STREAM_URLS = {
+    model: f"{GEMINI_API_ROOT}/v1beta/models/{model}:streamGenerateContent?alt=sse&key={GOOGLE_API_KEY}"
+    for model in GEMINI_MODELS
+}
+
+# The pair that answered last; the next turn tries it first instead of
+# re-probing pairs that already failed. A single reference, so plain
+# assignment is thread-safe.
+_working_pair: Optional[Tuple[str, str]] = None
+
+
+def _gemini_targets() -> List[Tuple[str, str]]:
+    """GEMINI_TARGETS with the last working pair moved to the front."""
+    pair = _working_pair
+    if pair is None or pair == GEMINI_TARGETS[0]:
+        return GEMINI_TARGETS
+    return [pair] + [target for target in GEMINI_TARGETS if target != pair]
+
+
+def _gemini_result(model_name: str, api_version: str, resp) -> Tuple[Optional[str], Optional[str]]:
+    """Read a generateContent response (requests or httpx). Returns (text, None) or (None, error)."""
+    global _working_pair
+    if resp.status_code == 200:
+        data = orjson.loads(resp.content)
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+        logger.info("Gemini success: model=%s, api=%s", model_name, api_version)
+        _working_pair = (model_name, api_version)
+        gemini_budget(model_name).succeeded()
+        return text, None
+    if resp.status_code == 429:
+        gemini_budget(model_name).back_off()
+    logger.warning("Gemini %s (%s): %s", model_name, api_version, resp.status_code)
+    return None, f"{resp.status_code}: {resp.text[:300]}"
+
+
+# Error for a model skipped because it is out of its shared request budget;
+# "429" so _classify_error reports it as rate limited
+_OUT_OF_BUDGET = "429: out of local rate budget"
+
+
+async def _gemini_attempt(
+    model_name: str,
+    api_version: str,
+    payload: bytes,
+    timeout: Optional[float] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    One generateContent call over the shared HTTP/2 client. Returns
+    (text, None) on success, else (None, error). timeout defaults to the
+    model's adaptive timeout. A model out of its shared request budget is
+    skipped without a request.
+    """
+    key = ("gemini", model_name)
+    if not gemini_budget(model_name).try_acquire():
+        return None, _OUT_OF_BUDGET
+    if timeout is None:
+        timeout = _adaptive_timeout(key, GEMINI_TIMEOUT)
+    try:
+        start = time.monotonic()
+        resp = await async_http.post(_GEMINI_URLS[model_name, api_version], content=payload, headers=JSON_HEADERS, timeout=timeout)
+        text, error = _gemini_result(model_name, api_version, resp)
+        if text is not None:
+            _record_latency(key, time.monotonic() - start)
+        return text, error
+    except httpx.TimeoutException:
+        logger.warning("Gemini %s (%s): timeout", model_name, api_version)
+        _record_latency(key, timeout)
+        return None, "Request timed out"
+    except Exception as e:
+        logger.warning("Gemini %s (%s): %s", model_name, api_version, e)
+        return None, str(e)
+
+
+async def _chat_with_gemini(
     system_prompt: str,
     message: str,
     history: List[Dict[str, str]],
 ) -> Dict[str, Any]:
-    """Send a chat request to Google Gemini via direct REST API."""
+    """
+    Send a chat request to Google Gemini via direct REST API.
+
+    Tries the primary model first (retrying once on timeout). Only if that
+    fails are the remaining model/API-version pairs tried, all at once over
+    one HTTP/2 connection, taking the first success.
+    """
     if not GOOGLE_API_KEY:
         return {"success": False, "error_type": "not_configured", "error": "Google Gemini API key not configured."}
 
-    import requests
+    payload = _gemini_payload(system_prompt, message, history)
 
-    full_prompt = system_prompt + "\n\n"
-    for msg in history:
-        role_label = "User" if msg["role"] == "user" else "Assistant"
-        full_prompt += f"{role_label}: {msg['content']}\n\n"
-    full_prompt += f"User: {message}\n\nAssistant:"
+    targets = _gemini_targets()
+    primary, alternates = targets[0], targets[1:]
+    errors = []
 
-    payload = {"contents": [{"parts": [{"text": full_prompt}]}]}
-    last_error = None
+    timeout = _adaptive_timeout(("gemini", primary[0]), GEMINI_TIMEOUT)
+    for _ in range(2):
+        text, error = await _gemini_attempt(*primary, payload, timeout)
+        if text is not None:
+            return {"success": True, "response": text}
+        errors.append(error)
+        if error != "Request timed out":
+            break
+        # Retry a timeout once with double the budget
+        timeout = min(2 * timeout, GEMINI_TIMEOUT)
 
-    for model_name in GEMINI_MODELS:
-        for api_version in ["v1", "v1beta"]:
-            url = f"https://generativelanguage.googleapis.com/{api_version}/models/{model_name}:generateContent?key={GOOGLE_API_KEY}"
-            try:
-                resp = requests.post(url, json=payload, timeout=30)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    text = data["candidates"][0]["content"]["parts"][0]["text"]
-                    logger.info(f"Gemini success: model={model_name}, api={api_version}")
-                    return {"success": True, "response": text}
-                else:
-                    last_error = f"{resp.status_code}: {resp.text[:300]}"
-                    logger.warning(f"Gemini {model_name} ({api_version}): {resp.status_code}")
-            except requests.exceptions.Timeout:
-                last_error = "Request timed out"
-                logger.warning(f"Gemini {model_name} ({api_version}): timeout")
-            except Exception as e:
-                last_error = str(e)
-                logger.warning(f"Gemini {model_name} ({api_version}): {e}")
-
-    logger.error(f"All Gemini models failed. Last error: {last_error}")
-    error_str = (last_error or "").lower()
-    if "429" in error_str or "quota" in error_str or "rate" in error_str:
-        return {"success": False, "error_type": "rate_limited", "error": last_error}
-    return {"success": False, "error_type": "unknown", "error": last_error}
+    tasks = [asyncio.ensure_future(_gemini_attempt(model, version, payload)) for model, version in alternates]
+    try:
+        for attempt in asyncio.as_completed(tasks):
+            text, error = await attempt
+            if text is not None:
+                return {"success": True, "response": text}
+            errors.append(error)
+    finally:
+        # Don't wait on slower attempts once we have an answer
+        for task in tasks:
+            task.cancel()
+
+    return _gemini_failure(errors)
+
+
+def _gemini_failure(errors: List[str]) -> Dict[str, Any]:
+    """Failure result once every Gemini attempt has failed."""
+    global _working_pair
+    _working_pair = None
+    last_error = errors[-1]
+    logger.error("All Gemini models failed. Last error: %s", last_error)
+    return {"success": False, "error_type": _classify_error(" ".join(errors)), "error": last_error}
 
 
 OPENAI_MODEL = "gpt-4o-mini"
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
+OPENAI_TIMEOUT = 30  # seconds, at most
+
+
+def _build_openai_messages(
+    system_prompt: str,
+    message: str,
+    history: List[Dict[str, str]],
+) -> List[Dict[str, str]]:
+    """System prompt, prior turns, then the new user message, in OpenAI's chat format."""
+    return [
+        {"role": "system", "content": system_prompt},
+        *({"role": msg["role"], "content": msg["content"]} for msg in history),
+        {"role": "user", "content": message},
+    ]
 
 
-def _chat_with_openai(
+async def _chat_with_openai(
     system_prompt: str,
     message: str,
     history: List[Dict[str, str]],
@@ -106,79 +348,152 @@ def _chat_with_openai(
     if not OPENAI_API_KEY:
         return {"success": False, "error_type": "not_configured", "error": "OpenAI API key not configured."}
 
-    import requests
+    messages = _build_openai_messages(system_prompt, message, history)
+
+    body = orjson.dumps({"model": OPENAI_MODEL, "messages": messages, "temperature": 0.7})
+    headers = {**JSON_HEADERS, "Authorization": f"Bearer {OPENAI_API_KEY}"}
+
+    key = ("openai", OPENAI_MODEL)
+    timeout = _adaptive_timeout(key, OPENAI_TIMEOUT)
+    for attempt in range(2):
+        try:
+            start = time.monotonic()
+            resp = await async_http.post(OPENAI_API_URL, content=body, headers=headers, timeout=timeout)
+        except httpx.TimeoutException:
+            _record_latency(key, timeout)
+            if attempt or timeout >= OPENAI_TIMEOUT:
+                break
+            # Retry a timeout once with double the budget
+            timeout = min(2 * timeout, OPENAI_TIMEOUT)
+            continue
+        except Exception as e:
+            return {"success": False, "error_type": "unknown", "error": str(e)}
+        if resp.status_code == 200:
+            _record_latency(key, time.monotonic() - start)
+        return _openai_result(resp)
 
-    messages = [{"role": "system", "content": system_prompt}]
-    for msg in history:
-        messages.append({"role": msg["role"], "content": msg["content"]})
-    messages.append({"role": "user", "content": message})
+    return {"success": False, "error_type": "unknown", "error": "OpenAI request timed out"}
 
-    payload = {"model": OPENAI_MODEL, "messages": messages, "temperature": 0.7}
-    headers = {"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"}
 
-    try:
-        resp = requests.post(OPENAI_API_URL, json=payload, headers=headers, timeout=30)
-        if resp.status_code == 200:
-            text = resp.json()["choices"][0]["message"]["content"]
-            logger.info(f"OpenAI chat success: model={OPENAI_MODEL}")
-            return {"success": True, "response": text}
-        else:
-            last_error = f"OpenAI {resp.status_code}: {resp.text[:300]}"
-            logger.warning(f"OpenAI {OPENAI_MODEL}: {resp.status_code}")
-            return {"success": False, "error_type": "unknown", "error": last_error}
-    except requests.exceptions.Timeout:
-        return {"success": False, "error_type": "unknown", "error": "OpenAI request timed out"}
-    except Exception as e:
-        return {"success": False, "error_type": "unknown", "error": str(e)}
+def _openai_result(resp) -> Dict[str, Any]:
+    """Read a chat completions response (requests or httpx) into a result dict."""
+    if resp.status_code == 200:
+        text = orjson.loads(resp.content)["choices"][0]["message"]["content"]
+        logger.info("OpenAI chat success: model=%s", OPENAI_MODEL)
+        return {"success": True, "response": text}
+    last_error = f"OpenAI {resp.status_code}: {resp.text[:300]}"
+    logger.warning("OpenAI %s: %s", OPENAI_MODEL, resp.status_code)
+    return {"success": False, "error_type": "unknown", "error": last_error}
+
+
+# In-flight async chat calls keyed by their full input (prompt, message, history)
+_inflight_chats: Dict[Tuple[str, str, tuple], asyncio.Future] = {}
 
 
-def chat_about_article(
+async def chat_about_article_async(
     article: Dict[str, Any],
     message: str,
     history: List[Dict[str, str]],
-    provider: str = "gemini",
 ) -> Dict[str, Any]:
     """
-    Chat about a paper using Google Gemini.
+    Chat about a paper, trying each provider in CHAT_PROVIDER_ORDER
+    (see _hedged_chat).
+
+    Identical requests that arrive while one is already in flight (say,
+    several readers asking "What does this paper do?" about the same paper)
+    share that one LLM call instead of each sending their own.
 
     Args:
         article: The paper's metadata dict (title, authors, summary, etc.)
         message: The user's current message
         history: List of previous messages, each with "role" and "content"
-        provider: Kept for API compatibility (always uses Gemini)
 
     Returns:
         Dict with:
         - "response": the AI's answer (or error message)
-        - "provider": "gemini"
+        - "provider": the provider that answered, or "none"
         - "error_type": type of error if failed (optional)
         - "suggestion": friendly suggestion if failed (optional)
     """
     system_prompt = _build_system_prompt(article)
+    history = _trim_history(history)
 
-    result = _chat_with_gemini(system_prompt, message, history)
-
-    if result["success"]:
-        return {"response": result["response"], "provider": "gemini"}
-
-    # Gemini failed — try OpenAI fallback
-    if OPENAI_API_KEY:
-        logger.warning("Gemini chat failed, trying OpenAI fallback")
-        openai_result = _chat_with_openai(system_prompt, message, history)
-        if openai_result["success"]:
-            return {"response": openai_result["response"], "provider": "openai"}
-
-    # Both failed -- return friendly error
-    error_type = result.get("error_type", "unknown")
-    
-    suggestions = {
-        "rate_limited": "The AI is busy right now. Please wait a moment and try again.",
-        "credits_exhausted": "The AI is temporarily unavailable. Please try again later.",
-        "not_configured": "The AI is not available right now.",
-        "unknown": "Something went wrong. Please try again.",
-    }
-    
-    suggestion = suggestions.get(error_type, "Please try again.")
+    key = (system_prompt, message, tuple((msg["role"], msg["content"]) for msg in history))
+    task = _inflight_chats.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_hedged_chat(system_prompt, message, history))
+        _inflight_chats[key] = task
+        task.add_done_callback(lambda _: _inflight_chats.pop(key, None))
+    # Shielded so one client disconnecting doesn't cancel the others' answer
+    return await asyncio.shield(task)
+
+
+async def _hedged_chat(
+    system_prompt: str,
+    message: str,
+    history: List[Dict[str, str]],
+) -> Dict[str, Any]:
+    """
+    Run the provider chain with hedging: if a provider hasn't answered
+    within its p95 latency (see _hedge_delay) or has failed, the next one
+    is started alongside it and the first success wins.
+    """
+    error_type = "unknown"
+
+    chain = _provider_chain()
+    waiting = list(chain)
+    names: Dict[asyncio.Future, str] = {}
+    pending = set()
+
+    delay = _hedge_delay(chain[0])
+
+    def start_next():
+        name = waiting.pop(0)
+        task = asyncio.ensure_future(PROVIDERS[name].chat(system_prompt, message, history))
+        names[task] = name
+        pending.add(task)
+
+    start_next()
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=delay if waiting else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                name = names[task]
+                result = task.result()
+                if result["success"]:
+                    return {"response": result["response"], "provider": name}
+                if name == chain[0]:
+                    error_type = result.get("error_type", "unknown")
+                logger.warning("%s chat failed, trying next provider", name)
+            # Either everything in flight failed or the hedge delay passed
+            if waiting:
+                if not done:
+                    logger.info("No chat answer after %.1fs, hedging with %s", delay, waiting[0])
+                start_next()
+    finally:
+        # Drop the losing request once we have an answer
+        for task in pending:
+            task.cancel()
+
+    return _friendly_error(error_type)
+
+
+# User-facing message for each error_type
+_SUGGESTIONS = {
+    "rate_limited": "The AI is busy right now. Please wait a moment and try again.",
+    "credits_exhausted": "The AI is temporarily unavailable. Please try again later.",
+    "not_configured": "The AI is not available right now.",
+    "unknown": "Something went wrong. Please try again.",
+}
+
+
+def _friendly_error(error_type: str) -> Dict[str, Any]:
+    """Build the user-facing error result when every provider failed."""
+    suggestion = _SUGGESTIONS.get(error_type, "Please try again.")
 
     return {
         "response": suggestion,
@@ -186,3 +501,164 @@ def chat_about_article(
         "error_type": error_type,
         "suggestion": suggestion,
     }
+
+
+# --------------- Streaming ---------------
+
+
+def _iter_sse_data(resp) -> Iterator[str]:
+    """Yield the payload of each `data:` line from a streaming HTTP response."""
+    for line in resp.iter_lines(decode_unicode=True):
+        if line and line.startswith("data:"):
+            yield line[len("data:"):].strip()
+
+
+def _stream_gemini(
+    system_prompt: str,
+    message: str,
+    history: List[Dict[str, str]],
+) -> Iterator[str]:
+    """
+    Stream text chunks from Gemini's streamGenerateContent endpoint.
+    Raises RuntimeError if no model could start a stream.
+    """
+    if not GOOGLE_API_KEY:
+        raise RuntimeError("not_configured")
+
+    payload = _gemini_payload(system_prompt, message, history)
+    last_error = None
+
+    for model_name in GEMINI_MODELS:
+        budget = gemini_budget(model_name)
+        if not budget.try_acquire():
+            last_error = _OUT_OF_BUDGET
+            continue
+        url = _GEMINI_STREAM_URLS[model_name]
+        try:
+            with http_session.post(url, data=payload, headers=JSON_HEADERS, timeout=30, stream=True) as resp:
+                if resp.status_code != 200:
+                    if resp.status_code == 429:
+                        budget.back_off()
+                    last_error = f"{resp.status_code}"
+                    logger.warning("Gemini stream %s: %s", model_name, resp.status_code)
+                    continue
+                budget.succeeded()
+                logger.info("Gemini stream started: model=%s", model_name)
+                for data in _iter_sse_data(resp):
+                    chunk = orjson.loads(data)
+                    for part in chunk.get("candidates", [{}])[0].get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+                return
+        except requests.exceptions.Timeout:
+            last_error = "timeout"
+            logger.warning("Gemini stream %s: timeout", model_name)
+        except Exception as e:
+            last_error = str(e)
+            logger.warning("Gemini stream %s: %s", model_name, e)
+
+    raise RuntimeError(_classify_error(last_error or ""))
+
+
+def _stream_openai(
+    system_prompt: str,
+    message: str,
+    history: List[Dict[str, str]],
+) -> Iterator[str]:
+    """Stream text chunks from OpenAI chat completions (stream=True)."""
+    if not OPENAI_API_KEY:
+        raise RuntimeError("not_configured")
+
+    messages = _build_openai_messages(system_prompt, message, history)
+
+    payload = {"model": OPENAI_MODEL, "messages": messages, "temperature": 0.7, "stream": True}
+    headers = {**JSON_HEADERS, "Authorization": f"Bearer {OPENAI_API_KEY}"}
+
+    with http_session.post(OPENAI_API_URL, data=orjson.dumps(payload), headers=headers, timeout=30, stream=True) as resp:
+        if resp.status_code != 200:
+            logger.warning("OpenAI stream %s: %s", OPENAI_MODEL, resp.status_code)
+            raise RuntimeError("unknown")
+        for data in _iter_sse_data(resp):
+            if data == "[DONE]":
+                return
+            delta = orjson.loads(data)["choices"][0].get("delta", {})
+            if delta.get("content"):
+                yield delta["content"]
+
+
+# --------------- Provider registry ---------------
+
+
+class ChatProvider(NamedTuple):
+    """
+    One provider's entry points, all taking (system_prompt, message, history).
+    chat returns a result dict with "success"; stream yields text
+    and raises RuntimeError(error_type) on failure.
+    """
+    chat: Callable[..., Awaitable[Dict[str, Any]]]
+    stream: Callable[..., Iterator[str]]
+
+
+PROVIDERS: Dict[str, ChatProvider] = {
+    "gemini": ChatProvider(_chat_with_gemini, _stream_gemini),
+    "openai": ChatProvider(_chat_with_openai, _stream_openai),
+}
+
+
+# API key each provider needs
+_PROVIDER_KEYS = {"gemini": GOOGLE_API_KEY, "openai": OPENAI_API_KEY}
+
+
+def _provider_chain() -> List[str]:
+    """
+    Providers to try, in CHAT_PROVIDER_ORDER, skipping any without a key.
+    With none configured, the first is still tried so its
+    "not_configured" error reaches the user.
+    """
+    known = [name for name in CHAT_PROVIDER_ORDER if name in PROVIDERS] or ["gemini"]
+    return [name for name in known if _PROVIDER_KEYS[name]] or known[:1]
+
+
+def chat_about_article_stream(
+    article: Dict[str, Any],
+    message: str,
+    history: List[Dict[str, str]],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming version of chat_about_article_async.
+
+    Yields {"delta": "..."} events as text arrives, then a final
+    {"done": True, "provider": ...} event. If every provider fails before
+    producing text, the final event carries "error_type" and "suggestion"
+    like the non-streaming result.
+    """
+    system_prompt = _build_system_prompt(article)
+    history = _trim_history(history)
+    error_type = "unknown"
+
+    chain = _provider_chain()
+    for provider in chain:
+        started = False
+        try:
+            for text in PROVIDERS[provider].stream(system_prompt, message, history):
+                started = True
+                yield {"delta": text}
+            yield {"done": True, "provider": provider}
+            return
+        except Exception as e:
+            if started:
+                # Partial answer already reached the client; stop here
+                logger.error("%s stream failed mid-answer: %s", provider, e)
+                yield {"done": True, "provider": provider, "error_type": "unknown"}
+                return
+            if provider == chain[0]:
+                error_type = str(e) if str(e) in _SUGGESTIONS else "unknown"
+            logger.warning("%s stream failed, trying next provider: %s", provider, e)
+
+    failure = _friendly_error(error_type)
+    yield {
+        "done": True,
+        "provider": "none",
+        "error_type": failure["error_type"],
+        "suggestion": failure["suggestion"],
+    }
@@ -24,6 +24,17 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # Gemini model for chat (gemini-2.0-flash-lite has better rate limits for free tier)
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite")
 
+# Order in which chat providers are tried (comma-separated). Providers
+# without an API key are skipped; unknown names are ignored.
+CHAT_PROVIDER_ORDER = [
+    name.strip() for name in os.getenv("CHAT_PROVIDER_ORDER", "gemini,openai").split(",") if name.strip()
+]
+
+# Seconds the chat waits on a provider before also asking the next one
+# (hedged request). Whichever answers first wins. Only used until the
+# provider has enough latency samples; after that the delay is its p95.
+CHAT_HEDGE_DELAY = float(os.getenv("CHAT_HEDGE_DELAY", "6.0"))
+
 # Default number of articles to return per search
 DEFAULT_MAX_RESULTS = 5
 
@@ -0,0 +1,93 @@
+"""
+Lightweight CORS middleware for ArXiv Scholar AI.
+
+Our allowlist is a handful of fixed frontend URLs, so a straight-line ASGI
+middleware doing a set lookup per request is all we need. Behaves like
+Starlette's CORSMiddleware for that case: exact-origin matching,
+credentials allowed, and preflights answered without hitting the app.
+"""
+
+from typing import Iterable, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PREFLIGHT_MAX_AGE = 600  # seconds browsers may cache a preflight
+
+
+class FastCORS:
+    """ASGI middleware that applies CORS headers for an exact-match origin allowlist."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_origins: Iterable[str],
+        allow_methods: Iterable[str] = ("GET", "POST"),
+        allow_headers: Iterable[str] = ("Content-Type",),
+    ):
+        self.app = app
+        self.allowed = frozenset(allowed_origins)
+        self.allow_methods = frozenset(m.upper() for m in allow_methods)
+        self.allow_headers = frozenset(h.lower() for h in allow_headers)
+
+        # Headers are built once; only the echoed origin varies per request
+        self.simple_headers: List[Tuple[bytes, bytes]] = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        self.preflight_headers: List[Tuple[bytes, bytes]] = self.simple_headers + [
+            (b"access-control-allow-methods", ", ".join(sorted(self.allow_methods)).encode()),
+            (b"access-control-allow-headers", ", ".join(sorted(allow_headers)).encode()),
+            (b"access-control-max-age", str(PREFLIGHT_MAX_AGE).encode()),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        origin = headers.get(b"origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = origin.decode("latin-1") in self.allowed
+
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in headers:
+            await self._preflight(headers, origin, allowed, send)
+            return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"access-control-allow-origin", origin),
+                    *self.simple_headers,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, headers: dict, origin: bytes, allowed: bool, send: Send):
+        """Answer a CORS preflight directly, like Starlette's CORSMiddleware."""
+        method = headers[b"access-control-request-method"].decode("latin-1").upper()
+        requested = headers.get(b"access-control-request-headers", b"").decode("latin-1")
+        requested_headers = {h.strip().lower() for h in requested.split(",") if h.strip()}
+
+        ok = allowed and method in self.allow_methods and requested_headers <= self.allow_headers
+        if ok:
+            status, body = 200, b"OK"
+            response_headers = [(b"access-control-allow-origin", origin), *self.preflight_headers]
+        else:
+            status, body = 400, b"Disallowed CORS request"
+            response_headers = list(self.preflight_headers)
+
+        response_headers += [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,11 @@
+"""
+Shared thread pools for ArXiv Scholar AI.
+Blocking work driven from async routes runs here instead of on the event
+loop, without starving the default executor FastAPI uses for sync routes.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Dedicated, bounded pool for blocking iterators streamed from async routes
+# (the chat stream). Shut down by the app lifespan.
+STREAM_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stream")
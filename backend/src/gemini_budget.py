@@ -0,0 +1,89 @@
+"""
+Shared Gemini request budgets for ArXiv Scholar AI.
+Gemini's free-tier quota is per API key and per model, so every caller
+(the MCP agent, the ELI10 chat, summaries, topic suggestions, embeddings)
+draws from one budget per model instead of each keeping its own count.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Local request budget per Gemini model, just under the free tier's 30 RPM,
+# so we skip a model instead of spending a round trip on a certain 429
+GEMINI_RPM = 28
+GEMINI_BACKOFF_MAX = 60  # seconds a model is skipped after repeated 429s
+
+# Models whose free-tier quota differs from GEMINI_RPM
+MODEL_RPM = {
+    "text-embedding-004": 1400,
+}
+
+# Budgets live in process memory; with several uvicorn workers the key's
+# quota is split between them
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+
+class ModelBudget:
+    """
+    Token bucket plus 429 backoff for one Gemini model.
+    Never waits: a model without budget is skipped, so the caller falls
+    through to the next model (or its fallback) right away. Locked, since
+    the chat and summarizer call Gemini from worker threads.
+    """
+
+    def __init__(self, rpm: int = GEMINI_RPM):
+        self.capacity = rpm
+        self.tokens = float(rpm)
+        self.refill_rate = rpm / 60  # tokens per second
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take one request from the budget, or return False if there is none."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return False
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def back_off(self):
+        """After a 429: skip this model for an exponentially growing, jittered interval."""
+        with self._lock:
+            self.strikes += 1
+            delay = min(GEMINI_BACKOFF_MAX, 2 ** self.strikes + random.random())
+            self.blocked_until = time.monotonic() + delay
+            strikes = self.strikes
+        logger.info("Backing off Gemini model for %.1fs (429 #%s)", delay, strikes)
+
+    def succeeded(self):
+        with self._lock:
+            self.strikes = 0
+
+
+_budgets: Dict[str, ModelBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def gemini_budget(model: str) -> ModelBudget:
+    """The process-wide budget for model, created on first use."""
+    budget = _budgets.get(model)
+    if budget is None:
+        with _budgets_lock:
+            budget = _budgets.get(model)
+            if budget is None:
+                rpm = max(1, MODEL_RPM.get(model, GEMINI_RPM) // WORKERS)
+                budget = _budgets[model] = ModelBudget(rpm)
+    return budget
@@ -0,0 +1,38 @@
+"""
+Shared HTTP clients for ArXiv Scholar AI.
+Every call to Gemini or OpenAI goes through one pooled client (a
+requests.Session for blocking code, an httpx.AsyncClient for async code),
+so repeat calls reuse keep-alive connections instead of paying a new
+TCP + TLS handshake each time.
+"""
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# Request bodies are pre-serialized with orjson, so the content type is set by hand
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# A few hosts (Gemini, OpenAI), many concurrent worker threads per host
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+
+# Global session instance
+http_session = requests.Session()
+http_session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE),
+)
+
+# Global async client: HTTP/2, so concurrent requests to one host share a
+# single multiplexed connection
+async_http = httpx.AsyncClient(
+    http2=True,
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=16),
+)
+
+
+async def aclose_async_http():
+    """Close the async client (call on app shutdown)."""
+    await async_http.aclose()
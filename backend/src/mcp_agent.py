@@ -11,17 +11,25 @@ LLM provider strategy (multi-provider, LLM-agnostic):
   2. OpenAI GPT-4o-mini — automatic fallback when all Gemini models are rate-limited
 """
 
+import asyncio
+import functools
 import json
 import logging
 import re
 import time
-from typing import AsyncGenerator, Dict, Any
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Dict, Any, NamedTuple, Optional
 
-import requests
+import httpx
+import orjson
+from cachetools import TTLCache
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 
 from .config import GOOGLE_API_KEY, OPENAI_API_KEY, MCP_SERVER_URL
+from .gemini_budget import gemini_budget
+from .http_session import JSON_HEADERS, async_http
+from .tool_schemas import mcp_tools_to_gemini, mcp_tools_to_openai, snapshot_tools
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,21 @@ OPENAI_MODEL = "gpt-4o-mini"
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 
 MAX_TOOL_RESULT_CHARS = 3000
+DELTA_QUEUE_SIZE = 64  # answer deltas buffered ahead of a slow client
+MAX_PAPER_AUTHORS = 5  # authors kept per paper when a result has to shrink
+
+# Tool output telling the agent arXiv is throttling us (see search_arxiv)
+_RATE_LIMITED_RE = re.compile(r"rate-limiting|do not retry", re.IGNORECASE)
+
+# Failures the MCP tools return as ordinary text (see mcp_server.py)
+_FAILED_RESULT_RE = re.compile(r"not found|^Could not ", re.IGNORECASE)
+
+# Tool results keyed by (name, canonical args JSON). The model often repeats
+# a call within a run, and users repeat queries across runs; hits skip the
+# MCP round trip. Only touched from the event loop, so no lock.
+TOOL_CACHE_TTL = 300  # seconds
+_tool_cache: TTLCache = TTLCache(maxsize=512, ttl=TOOL_CACHE_TTL)
+
 
 SYSTEM_PROMPT = (
     "You are ArXiv Scholar AI, a research assistant that helps users "
@@ -51,80 +74,28 @@ SYSTEM_PROMPT = (
 )
 
 
+# API keys or URLs in an error message, matched in a single pass
+_SANITIZE_RE = re.compile(r'(key=[A-Za-z0-9_-]+)|https?://\S+')
+
+
 def _sanitize_error(msg: str) -> str:
     """Strip API keys and URLs from error messages before sending to the client."""
-    msg = re.sub(r'key=[A-Za-z0-9_-]+', 'key=***', msg)
-    msg = re.sub(r'https?://\S+', '[API endpoint]', msg)
-    return msg
+    return _SANITIZE_RE.sub(lambda m: "key=***" if m.group(1) else "[API endpoint]", msg)
 
 
-# --------------- Tool Schema Converters ---------------
+# --------------- Agent Tool Declarations ---------------
 
 
-def _mcp_tools_to_gemini(mcp_tools: list) -> list:
-    """Convert MCP tool schemas to Gemini function declarations."""
-    type_map = {
-        "STRING": "STRING",
-        "INTEGER": "INTEGER",
-        "NUMBER": "NUMBER",
-        "BOOLEAN": "BOOLEAN",
-        "ARRAY": "ARRAY",
-        "OBJECT": "OBJECT",
-    }
-    declarations = []
-    for tool in mcp_tools:
-        schema = tool.inputSchema or {}
-        properties = schema.get("properties", {})
-        required = schema.get("required", [])
-
-        gemini_props = {}
-        for name, prop in properties.items():
-            prop_type = prop.get("type", "string").upper()
-            gemini_props[name] = {
-                "type": type_map.get(prop_type, "STRING"),
-                "description": prop.get("description", ""),
-            }
+class AgentTools(NamedTuple):
+    """The MCP tools as declared to each LLM provider."""
+    gemini: list
+    openai: list
 
-        declarations.append({
-            "name": tool.name,
-            "description": tool.description or "",
-            "parameters": {
-                "type": "OBJECT",
-                "properties": gemini_props,
-                "required": required,
-            },
-        })
-    return declarations
-
-
-def _mcp_tools_to_openai(mcp_tools: list) -> list:
-    """Convert MCP tool schemas to OpenAI function tool format."""
-    tools = []
-    for tool in mcp_tools:
-        schema = tool.inputSchema or {}
-        properties = schema.get("properties", {})
-        required = schema.get("required", [])
-
-        openai_props = {}
-        for name, prop in properties.items():
-            openai_props[name] = {
-                "type": prop.get("type", "string"),
-                "description": prop.get("description", ""),
-            }
 
-        tools.append({
-            "type": "function",
-            "function": {
-                "name": tool.name,
-                "description": tool.description or "",
-                "parameters": {
-                    "type": "object",
-                    "properties": openai_props,
-                    "required": required,
-                },
-            },
-        })
-    return tools
+@functools.lru_cache(maxsize=8)
+def _agent_tools(tool_key: tuple) -> AgentTools:
+    """Declarations for every MCP tool, in both formats. Treat the result as read-only."""
+    return AgentTools(mcp_tools_to_gemini(tool_key), mcp_tools_to_openai(tool_key))
 
 
 # --------------- Message Format Converters ---------------
@@ -193,7 +164,7 @@ def _openai_to_gemini_response(openai_data: dict) -> dict:
     """
     Convert OpenAI chat completion response to Gemini response format.
 
-    This lets _extract_text() and _extract_tool_calls() work unchanged,
+    This lets _extract_response() work unchanged,
     regardless of which provider generated the response.
     """
     choice = openai_data["choices"][0]
@@ -230,7 +201,15 @@ def _openai_to_gemini_response(openai_data: dict) -> dict:
 # --------------- LLM Call Functions ---------------
 
 
-def _call_gemini(messages: list, tools: list) -> dict:
+class StreamInterrupted(RuntimeError):
+    """A streamed answer failed after some of it was already sent to the client."""
+
+
+async def _call_gemini(
+    messages: list,
+    tools: list,
+    on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> dict:
     """
     Call Gemini API with function declarations.
 
@@ -238,48 +217,86 @@ def _call_gemini(messages: list, tools: list) -> dict:
     If both fail (429 or error), raises immediately so OpenAI fallback
     kicks in fast. No retry waits — 429 means "quota exhausted for ~60s"
     so retrying after 10-20s rarely helps and just makes the user wait.
+    Models out of local budget, or backing off after a 429, are skipped
+    without a request.
+
+    The response is streamed (streamGenerateContent): text parts are awaited
+    through on_delta as they arrive, function calls are collected until the
+    stream ends. Returns the assembled response in generateContent format.
     """
     payload: dict = {
         "systemInstruction": {"parts": [{"text": SYSTEM_PROMPT}]},
         "contents": messages,
         "tools": [{"functionDeclarations": tools}],
     }
-    payload_size = len(json.dumps(payload))
-    logger.info(f"Gemini payload: {payload_size} chars")
+    # Serialized once with orjson; the same bytes are sent to every model tried
+    body = orjson.dumps(payload)
+    logger.info("Gemini payload: %s bytes", len(body))
 
     last_error = None
 
     for model in GEMINI_MODELS:
-        url = f"{GEMINI_API_BASE}/{model}:generateContent?key={GOOGLE_API_KEY}"
+        budget = gemini_budget(model)
+        if not budget.try_acquire():
+            logger.info("Skipping %s: out of local rate budget", model)
+            last_error = f"Rate limited on {model}"
+            continue
+
+        url = f"{GEMINI_API_BASE}/{model}:streamGenerateContent?alt=sse&key={GOOGLE_API_KEY}"
+        streamed = False
         try:
-            resp = requests.post(url, json=payload, timeout=15)
-            if resp.status_code == 429:
-                reason = resp.text[:200]
-                logger.warning(f"429 on {model}: {reason}")
-                last_error = f"Rate limited on {model}"
-                continue
-            if resp.status_code != 200:
-                body = resp.text[:300]
-                logger.warning(f"{model} returned {resp.status_code}: {body}")
-                last_error = f"{model} returned {resp.status_code}"
-                continue
-            logger.info(f"Gemini OK on {model}, ~{len(resp.text)} chars")
-            return resp.json()
-        except requests.exceptions.Timeout:
+            async with async_http.stream("POST", url, content=body, headers=JSON_HEADERS, timeout=15) as resp:
+                if resp.status_code == 429:
+                    reason = (await resp.aread())[:200].decode(errors="replace")
+                    logger.warning("429 on %s: %s", model, reason)
+                    budget.back_off()
+                    last_error = f"Rate limited on {model}"
+                    continue
+                if resp.status_code != 200:
+                    detail = (await resp.aread())[:300].decode(errors="replace")
+                    logger.warning("%s returned %s: %s", model, resp.status_code, detail)
+                    last_error = f"{model} returned {resp.status_code}"
+                    continue
+
+                text_chunks = []
+                call_parts = []
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    for part in _extract_parts(orjson.loads(line[len("data:"):])):
+                        if "functionCall" in part:
+                            call_parts.append(part)
+                        elif part.get("text"):
+                            text_chunks.append(part["text"])
+                            if on_delta is not None:
+                                await on_delta(part["text"])
+                                streamed = True
+
+            text = "".join(text_chunks)
+            parts = ([{"text": text}] if text else []) + call_parts
+            logger.info("Gemini OK on %s, ~%s chars, %s calls", model, len(text), len(call_parts))
+            budget.succeeded()
+            return {"candidates": [{"content": {"role": "model", "parts": parts}}]}
+        except httpx.TimeoutException:
             last_error = f"Timeout calling {model}"
             logger.warning(last_error)
-            continue
         except Exception as e:
             last_error = str(e)
-            logger.warning(f"Error calling {model}: {e}")
-            continue
+            logger.warning("Error calling %s: %s", model, e)
+
+        # Part of this answer already reached the client; don't start a
+        # second one from the next model (or OpenAI) on top of it
+        if streamed:
+            raise StreamInterrupted(
+                f"The answer was cut off ({_sanitize_error(last_error or 'Unknown error')}). Please try again."
+            )
 
     raise RuntimeError(
         f"All Gemini models exhausted: {_sanitize_error(last_error or 'Unknown error')}"
     )
 
 
-def _call_openai(gemini_messages: list, openai_tools: list) -> dict:
+async def _call_openai(gemini_messages: list, openai_tools: list) -> dict:
     """
     Call OpenAI API as fallback. Converts Gemini conversation to OpenAI format,
     makes the call, and converts the response back to Gemini format.
@@ -297,56 +314,60 @@ def _call_openai(gemini_messages: list, openai_tools: list) -> dict:
         "tools": openai_tools,
         "temperature": 0.7,
     }
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-    }
+    headers = {**JSON_HEADERS, "Authorization": f"Bearer {OPENAI_API_KEY}"}
 
-    logger.info(f"Falling back to OpenAI {OPENAI_MODEL}")
+    logger.info("Falling back to OpenAI %s", OPENAI_MODEL)
     try:
-        resp = requests.post(OPENAI_API_URL, json=payload, headers=headers, timeout=30)
+        resp = await async_http.post(OPENAI_API_URL, content=orjson.dumps(payload), headers=headers, timeout=30)
         if resp.status_code != 200:
             body = resp.text[:300]
-            logger.warning(f"OpenAI {OPENAI_MODEL} returned {resp.status_code}: {body}")
+            logger.warning("OpenAI %s returned %s: %s", OPENAI_MODEL, resp.status_code, body)
             raise RuntimeError(f"OpenAI returned {resp.status_code}")
 
-        openai_data = resp.json()
-        logger.info(f"OpenAI OK on {OPENAI_MODEL}, ~{len(resp.text)} chars")
+        openai_data = orjson.loads(resp.content)
+        logger.info("OpenAI OK on %s, ~%s chars", OPENAI_MODEL, len(resp.text))
         return _openai_to_gemini_response(openai_data)
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         raise RuntimeError(f"Timeout calling OpenAI {OPENAI_MODEL}")
 
 
-def _call_llm(gemini_messages: list, gemini_tools: list, openai_tools: list) -> dict:
+async def _call_llm(
+    gemini_messages: list,
+    tools: AgentTools,
+    on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> dict:
     """
     Unified LLM call: tries Gemini first (2 models x 3 rounds),
     falls back to OpenAI if all Gemini attempts fail.
 
-    Returns a Gemini-format response dict in all cases.
+    Returns a Gemini-format response dict in all cases. Gemini's text is
+    also passed to on_delta as it streams in; OpenAI's is not.
     """
     gemini_available = bool(GOOGLE_API_KEY)
     openai_available = bool(OPENAI_API_KEY)
 
     if gemini_available:
         try:
-            return _call_gemini(gemini_messages, gemini_tools)
+            return await _call_gemini(gemini_messages, tools.gemini, on_delta)
+        except StreamInterrupted:
+            raise
         except RuntimeError as gemini_err:
             if not openai_available:
                 sanitized = _sanitize_error(str(gemini_err))
                 raise RuntimeError(
                     f"Gemini is busy ({sanitized}). Please wait about 60 seconds and try again."
                 )
-            logger.warning(f"Gemini failed, trying OpenAI fallback: {gemini_err}")
+            logger.warning("Gemini failed, trying OpenAI fallback: %s", gemini_err)
 
     if openai_available:
         try:
-            return _call_openai(gemini_messages, openai_tools)
+            return await _call_openai(gemini_messages, tools.openai)
         except RuntimeError as openai_err:
             err_str = str(openai_err)
             if "401" in err_str:
-                logger.error(f"OpenAI auth failed: {openai_err}")
+                logger.error("OpenAI auth failed: %s", openai_err)
                 raise RuntimeError("OpenAI authentication failed. Check API key permissions.")
-            logger.error(f"OpenAI fallback also failed: {openai_err}")
+            logger.error("OpenAI fallback also failed: %s", openai_err)
             raise RuntimeError(
                 f"AI is busy ({_sanitize_error(err_str)}). Please try again."
             )
@@ -354,35 +375,337 @@ def _call_llm(gemini_messages: list, gemini_tools: list, openai_tools: list) ->
     raise RuntimeError("No AI API key configured.")
 
 
+class _StreamedLLMCall:
+    """
+    Runs one _call_llm in a task so the agent can forward its text deltas
+    while the call is still in flight:
+
+        call = _StreamedLLMCall(conversation, tools)
+        async for delta in call.deltas():
+            yield {"type": "answer_delta", "content": delta}
+        response = await call.response()
+    """
+
+    def __init__(self, gemini_messages: list, tools: AgentTools):
+        # Bounded: if the client reads slowly, the Gemini stream is read
+        # slowly too instead of piling deltas up in memory
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=DELTA_QUEUE_SIZE)
+        self._task = asyncio.create_task(_call_llm(gemini_messages, tools, self._queue.put))
+        # A cancelled speculative call's error is never awaited; mark it seen
+        self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def deltas(self) -> AsyncIterator[str]:
+        """Yield text deltas until the call finishes."""
+        try:
+            while not self._task.done():
+                getter = asyncio.ensure_future(self._queue.get())
+                await asyncio.wait({getter, self._task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            while not self._queue.empty():
+                yield self._queue.get_nowait()
+        finally:
+            # The consumer went away (client disconnected): stop the request
+            self._task.cancel()
+
+    async def response(self) -> dict:
+        """The assembled response; raises whatever _call_llm raised."""
+        return await self._task
+
+    def cancel(self):
+        self._task.cancel()
+
+
 # --------------- Response Extractors ---------------
 
 
-def _extract_text(response: dict) -> str | None:
-    """Pull text from a Gemini-format response."""
+def _extract_parts(response: dict) -> list:
+    """Content parts of the first candidate in a Gemini-format response (or chunk)."""
     try:
-        for part in response["candidates"][0]["content"]["parts"]:
-            if "text" in part:
-                return part["text"]
+        return response["candidates"][0]["content"].get("parts", [])
     except (KeyError, IndexError):
-        pass
-    return None
+        return []
 
 
-def _extract_tool_calls(response: dict) -> list:
-    """Pull function-call requests from a Gemini-format response."""
+def _extract_response(response: dict) -> tuple[str | None, list]:
+    """
+    Pull (first text, function-call requests) from a Gemini-format response
+    in a single pass over its parts.
+    """
+    text = None
     calls = []
+    for part in _extract_parts(response):
+        if "functionCall" in part:
+            calls.append(part["functionCall"])
+        elif text is None and "text" in part:
+            text = part["text"]
+    return text, calls
+
+
+# --------------- MCP Session Pool ---------------
+
+
+# A warm session per MCP server URL, shared by concurrent agent runs, so a
+# query doesn't pay the SSE connect + initialize + list_tools round trips.
+SESSION_IDLE_TIMEOUT = 60  # seconds before an unused session is closed
+SESSION_PING_AFTER = 10    # idle seconds after which a reused session is pinged first
+SESSION_PING_TIMEOUT = 2   # seconds
+
+# Tool snapshot from the last session to each URL. A run that has to
+# connect starts its first LLM call against it while the handshake runs.
+_known_tool_keys: Dict[str, tuple] = {}
+
+
+class PooledSession:
+    """
+    One long-lived MCP client session plus its discovered tools.
+
+    The SSE and session context managers must be entered and exited in the
+    same task, so a background task owns them for the session's lifetime.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.session: Optional[ClientSession] = None
+        self.tools: list = []
+        self.tool_key: tuple = ()
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self._ping: Optional[asyncio.Future] = None
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            async with sse_client(self.url) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    self.tools = (await session.list_tools()).tools
+                    self.tool_key = _known_tool_keys[self.url] = snapshot_tools(self.tools)
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning("MCP session to %s ended: %s", self.url, e)
+        finally:
+            self.session = None
+            self._ready.set()
+
+    @property
+    def alive(self) -> bool:
+        return not self._task.done()
+
+    async def healthy(self) -> bool:
+        """
+        Ping a session that has sat idle, in case the server went away
+        meanwhile. Borrowers arriving during the ping wait for its result
+        instead of sending their own.
+        """
+        if self._ping is not None:
+            return await asyncio.shield(self._ping)
+        if self.session is None or self.in_use > 1:
+            return True
+        if time.monotonic() - self.last_used < SESSION_PING_AFTER:
+            return True
+        self._ping = asyncio.ensure_future(self._send_ping())
+        try:
+            return await asyncio.shield(self._ping)
+        finally:
+            self._ping = None
+
+    async def _send_ping(self) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), SESSION_PING_TIMEOUT)
+        except Exception as e:
+            logger.warning("Pooled MCP session to %s failed ping: %s", self.url, e)
+            return False
+        self.last_used = time.monotonic()
+        return True
+
+    def discard(self):
+        """Start closing the session without waiting for it."""
+        self._closing.set()
+
+    async def wait_ready(self):
+        """Wait for the session to connect; raises if it couldn't."""
+        await self._ready.wait()
+        if self.session is None:
+            raise RuntimeError(str(self._error or "MCP session closed"))
+
+    async def close(self):
+        self._closing.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+_pool: Dict[str, PooledSession] = {}
+_pool_lock = asyncio.Lock()
+_pool_hits = 0
+_pool_misses = 0
+
+
+@asynccontextmanager
+async def _acquire_session(url: str) -> AsyncIterator[PooledSession]:
+    """Borrow the pooled session for url, connecting a new one if needed."""
+    global _pool_hits, _pool_misses
+    async with _pool_lock:
+        pooled = _pool.get(url)
+        if pooled is None or not pooled.alive:
+            pooled = _pool[url] = PooledSession(url)
+            _pool_misses += 1
+        else:
+            _pool_hits += 1
+        pooled.in_use += 1
+
+    # The health ping runs outside the lock: the lock is never held across
+    # network I/O, and borrowers of a session being pinged share that ping
+    if not await pooled.healthy():
+        pooled.in_use -= 1
+        async with _pool_lock:
+            if _pool.get(url) is pooled:
+                pooled.discard()
+                _pool[url] = PooledSession(url)
+                _pool_misses += 1
+            pooled = _pool[url]
+            pooled.in_use += 1
+    logger.debug("MCP session pool: %s hits, %s misses", _pool_hits, _pool_misses)
+
     try:
-        for part in response["candidates"][0]["content"]["parts"]:
-            if "functionCall" in part:
-                calls.append(part["functionCall"])
-    except (KeyError, IndexError):
-        pass
-    return calls
+        await pooled.wait_ready()
+        yield pooled
+    finally:
+        pooled.in_use -= 1
+        pooled.last_used = time.monotonic()
+
+
+async def cleanup_idle_sessions():
+    """Background task: close pooled sessions unused for SESSION_IDLE_TIMEOUT."""
+    while True:
+        await asyncio.sleep(SESSION_IDLE_TIMEOUT / 2)
+        now = time.monotonic()
+        async with _pool_lock:
+            idle = [
+                url for url, pooled in _pool.items()
+                if not pooled.in_use and now - pooled.last_used > SESSION_IDLE_TIMEOUT
+            ]
+            closing = [_pool.pop(url) for url in idle]
+        for pooled in closing:
+            logger.info("Closing idle MCP session to %s", pooled.url)
+            await pooled.close()
+
+
+async def close_session_pool():
+    """Close every pooled session (call on app shutdown)."""
+    async with _pool_lock:
+        closing = list(_pool.values())
+        _pool.clear()
+    await asyncio.gather(*(pooled.close() for pooled in closing))
 
 
 # --------------- MCP Agentic Loop ---------------
 
 
+def _compact_json(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _shrink_for_gemini(text: str, budget: int = MAX_TOOL_RESULT_CHARS) -> str:
+    """
+    Fit a tool result into the LLM's budget without breaking its JSON.
+
+    Paper lists are reduced step by step (abstracts, then long author
+    lists, then trailing papers) and re-serialized. Anything else is cut
+    at the budget. Only the LLM's copy is shrunk; the frontend still gets
+    the full result.
+    """
+    if len(text) <= budget:
+        return text
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    papers = data.get("papers") if isinstance(data, dict) else data
+    if isinstance(papers, list) and papers and all(isinstance(p, dict) for p in papers):
+        for paper in papers:
+            paper.pop("summary", None)
+            paper.pop("abstract", None)
+        shrunk = _compact_json(data)
+        if len(shrunk) <= budget:
+            return shrunk
+
+        for paper in papers:
+            authors = paper.get("authors")
+            if isinstance(authors, list) and len(authors) > MAX_PAPER_AUTHORS:
+                paper["authors"] = authors[:MAX_PAPER_AUTHORS] + ["et al."]
+        shrunk = _compact_json(data)
+        if len(shrunk) <= budget:
+            return shrunk
+
+        omitted = 0
+        while len(papers) > 1 and len(shrunk) > budget:
+            papers.pop()
+            omitted += 1
+            if isinstance(data, dict):
+                data["omitted"] = omitted
+            shrunk = _compact_json(data)
+        if len(shrunk) <= budget:
+            return shrunk
+
+    return text[:budget] + "\n...[truncated]"
+
+
+def _is_cacheable(text: str) -> bool:
+    """Whether a tool result is a success worth reusing (not an error payload)."""
+    if _RATE_LIMITED_RE.search(text) or _FAILED_RESULT_RE.search(text):
+        return False
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return True
+    return not (isinstance(data, dict) and "error" in data)
+
+
+def _forget_papers(search_text: str):
+    """
+    Drop cached per-paper results for the papers a search just stored, so a
+    lookup that ran before the search doesn't outlive it.
+    """
+    try:
+        papers = json.loads(search_text).get("papers") or []
+        ids = {paper["id"] for paper in papers}
+    except (ValueError, AttributeError, KeyError, TypeError):
+        return
+    for key in list(_tool_cache):
+        name, args_json = key
+        if name != "search_arxiv" and json.loads(args_json).get("article_id") in ids:
+            _tool_cache.pop(key, None)
+
+
+async def _call_tool_cached(session: ClientSession, name: str, args: dict) -> str:
+    """
+    Call an MCP tool and return its text, reusing a recent identical call.
+    Errors, not-found results and rate-limit notices are not cached.
+    """
+    key = (name, json.dumps(args, sort_keys=True, separators=(",", ":")))
+    cached = _tool_cache.get(key)
+    if cached is not None:
+        logger.info("Tool cache hit: %s", name)
+        return cached
+
+    result = await session.call_tool(name, args)
+    text = result.content[0].text if result.content else "No result."
+    if name == "search_arxiv":
+        _forget_papers(text)
+    if not result.isError and _is_cacheable(text):
+        _tool_cache[key] = text
+    return text
+
+
 async def run_mcp_agent(query: str) -> AsyncGenerator[Dict[str, Any], None]:
     """
     Run the MCP agentic loop for a user query.
@@ -391,7 +714,9 @@ async def run_mcp_agent(query: str) -> AsyncGenerator[Dict[str, Any], None]:
     and executes them through the MCP protocol. Yields reasoning step
     dicts for SSE streaming to the frontend.
 
-    Each step: {"type": "thinking"|"tool_call"|"tool_result"|"answer"|"error", "content": ...}
+    Each step: {"type": "thinking"|"tool_call"|"tool_result"|"answer_delta"|"answer"|"error", "content": ...}
+    answer_delta steps carry the model's text as it streams in; the final
+    answer step repeats the complete text.
     """
     if not GOOGLE_API_KEY and not OPENAI_API_KEY:
         yield {"type": "error", "content": "No AI API key configured."}
@@ -399,128 +724,146 @@ async def run_mcp_agent(query: str) -> AsyncGenerator[Dict[str, Any], None]:
 
     yield {"type": "thinking", "content": "Connecting to MCP server..."}
 
-    try:
-        async with sse_client(MCP_SERVER_URL) as (read_stream, write_stream):
-            async with ClientSession(read_stream, write_stream) as session:
-                await session.initialize()
-
-                # Discover tools dynamically from the MCP server
-                tools_result = await session.list_tools()
-                mcp_tools = tools_result.tools
-                gemini_tools = _mcp_tools_to_gemini(mcp_tools)
-                openai_tools = _mcp_tools_to_openai(mcp_tools)
-
-                tool_names = [t.name for t in mcp_tools]
-                yield {
-                    "type": "thinking",
-                    "content": f"Connected to MCP server. Discovered {len(mcp_tools)} tools: {', '.join(tool_names)}. Understanding your query...",
-                }
+    conversation = [{"role": "user", "parts": [{"text": query}]}]
 
-                conversation = [{"role": "user", "parts": [{"text": query}]}]
+    # Plan against the last known tool set while the session is acquired:
+    # on a pool miss this hides the SSE handshake behind the LLM call
+    known_key = _known_tool_keys.get(MCP_SERVER_URL)
+    plan = _StreamedLLMCall(conversation, _agent_tools(known_key)) if known_key else None
 
+    try:
+        async with _acquire_session(MCP_SERVER_URL) as pooled:
+            session = pooled.session
+            mcp_tools = pooled.tools
+            tools = _agent_tools(pooled.tool_key)
+            if plan is not None and pooled.tool_key != known_key:
+                logger.info("MCP tool set changed, discarding speculative plan")
+                plan.cancel()
+                plan = None
+
+            tool_names = [t.name for t in mcp_tools]
+            yield {
+                "type": "thinking",
+                "content": f"Connected to MCP server. Discovered {len(mcp_tools)} tools: {', '.join(tool_names)}. Understanding your query...",
+            }
+
+            try:
+                call = plan or _StreamedLLMCall(conversation, tools)
+                async for delta in call.deltas():
+                    yield {"type": "answer_delta", "content": delta}
+                response = await call.response()
+            except Exception as e:
+                logger.error("LLM initial call failed: %s", e)
+                yield {"type": "error", "content": _sanitize_error(str(e))}
+                return
+
+            text, tool_calls = _extract_response(response)
+
+            # Fallback: if LLM skipped tools, force a search_arxiv call
+            if not tool_calls:
+                logger.warning("LLM returned no tool calls for query: %s. Forcing search_arxiv.", query)
+                yield {"type": "thinking", "content": "Searching arXiv for papers..."}
                 try:
-                    response = _call_llm(conversation, gemini_tools, openai_tools)
-                except Exception as e:
-                    logger.error(f"LLM initial call failed: {e}")
-                    yield {"type": "error", "content": _sanitize_error(str(e))}
-                    return
+                    forced_text = await _call_tool_cached(session, "search_arxiv", {"topic": query})
+                    yield {"type": "tool_call", "content": {"name": "search_arxiv", "args": {"topic": query}}}
+                    yield {"type": "tool_result", "content": {"name": "search_arxiv", "result": forced_text}}
 
-                tool_calls = _extract_tool_calls(response)
-
-                # Fallback: if LLM skipped tools, force a search_arxiv call
-                if not tool_calls:
-                    logger.warning(f"LLM returned no tool calls for query: {query}. Forcing search_arxiv.")
-                    yield {"type": "thinking", "content": "Searching arXiv for papers..."}
-                    try:
-                        forced_result = await session.call_tool("search_arxiv", {"topic": query})
-                        forced_text = forced_result.content[0].text if forced_result.content else "No result."
-                        yield {"type": "tool_call", "content": {"name": "search_arxiv", "args": {"topic": query}}}
-                        yield {"type": "tool_result", "content": {"name": "search_arxiv", "result": forced_text}}
-
-                        # Feed the result back to the LLM for a proper answer
-                        llm_result = forced_text
-                        if len(llm_result) > MAX_TOOL_RESULT_CHARS:
-                            llm_result = llm_result[:MAX_TOOL_RESULT_CHARS] + "\n...[truncated]"
-                        conversation.append(response["candidates"][0]["content"])
-                        conversation.append({
-                            "role": "function",
-                            "parts": [{"functionResponse": {"name": "search_arxiv", "response": {"result": llm_result}}}],
-                        })
-                        response = _call_llm(conversation, gemini_tools, openai_tools)
-                        tool_calls = _extract_tool_calls(response)
-                    except Exception as e:
-                        logger.error(f"Forced search_arxiv failed: {e}")
-
-                max_iterations = 10
-                iteration = 0
-                rate_limited = False
-
-                while tool_calls and iteration < max_iterations and not rate_limited:
-                    iteration += 1
+                    # Feed the result back to the LLM for a proper answer
+                    llm_result = _shrink_for_gemini(forced_text)
                     conversation.append(response["candidates"][0]["content"])
+                    conversation.append({
+                        "role": "function",
+                        "parts": [{"functionResponse": {"name": "search_arxiv", "response": {"result": llm_result}}}],
+                    })
+                    call = _StreamedLLMCall(conversation, tools)
+                    async for delta in call.deltas():
+                        yield {"type": "answer_delta", "content": delta}
+                    response = await call.response()
+                    text, tool_calls = _extract_response(response)
+                except Exception as e:
+                    logger.error("Forced search_arxiv failed: %s", e)
 
-                    function_responses = []
-                    for fc in tool_calls:
-                        fn_name = fc["name"]
-                        fn_args = fc.get("args", {})
-
-                        yield {"type": "tool_call", "content": {"name": fn_name, "args": fn_args}}
+            max_iterations = 10
+            iteration = 0
+            rate_limited = False
 
-                        try:
-                            result = await session.call_tool(fn_name, fn_args)
-                            full_result = result.content[0].text if result.content else "No result."
-                        except Exception as e:
-                            logger.error(f"MCP tool {fn_name} error: {e}")
-                            full_result = f"Error executing {fn_name}: {e}"
+            while tool_calls and iteration < max_iterations and not rate_limited:
+                iteration += 1
+                conversation.append(response["candidates"][0]["content"])
 
-                        # Stop the loop if arXiv is rate-limiting us
-                        if "rate-limiting" in full_result.lower() or "do not retry" in full_result.lower():
-                            rate_limited = True
+                # Announce every call, then run them concurrently: a turn
+                # takes as long as its slowest tool, not the sum
+                for fc in tool_calls:
+                    yield {"type": "tool_call", "content": {"name": fc["name"], "args": fc.get("args", {})}}
 
-                        # Send FULL result to frontend (so it can parse paper JSON)
-                        yield {
-                            "type": "tool_result",
-                            "content": {"name": fn_name, "result": full_result},
-                        }
+                results = await asyncio.gather(
+                    *(_call_tool_cached(session, fc["name"], fc.get("args", {})) for fc in tool_calls),
+                    return_exceptions=True,
+                )
 
-                        # Truncate for LLM conversation (save tokens, avoid timeouts)
-                        llm_result = full_result
-                        if len(llm_result) > MAX_TOOL_RESULT_CHARS:
-                            llm_result = llm_result[:MAX_TOOL_RESULT_CHARS] + "\n...[truncated]"
-
-                        function_responses.append({
-                            "functionResponse": {
-                                "name": fn_name,
-                                "response": {"result": llm_result},
-                            }
-                        })
-
-                    conversation.append({"role": "function", "parts": function_responses})
-
-                    try:
-                        response = _call_llm(conversation, gemini_tools, openai_tools)
-                    except Exception as e:
-                        logger.error(f"LLM follow-up call failed: {e}")
-                        # Graceful fallback: papers were already sent to frontend
-                        # via tool_result, so show a helpful message instead of error
-                        yield {
-                            "type": "answer",
-                            "content": "I found the papers above but couldn't generate a detailed summary right now due to high demand. You can click on any paper to read more, or try again in about 60 seconds for a full AI summary.",
+                function_responses = []
+                for fc, full_result in zip(tool_calls, results):
+                    fn_name = fc["name"]
+                    if isinstance(full_result, Exception):
+                        logger.error("MCP tool %s error: %s", fn_name, full_result)
+                        full_result = f"Error executing {fn_name}: {full_result}"
+
+                    # Stop the loop if arXiv is rate-limiting us
+                    if _RATE_LIMITED_RE.search(full_result):
+                        rate_limited = True
+
+                    # Send FULL result to frontend (so it can parse paper JSON)
+                    yield {
+                        "type": "tool_result",
+                        "content": {"name": fn_name, "result": full_result},
+                    }
+
+                    # Shrink for LLM conversation (save tokens, avoid timeouts)
+                    llm_result = _shrink_for_gemini(full_result)
+
+                    function_responses.append({
+                        "functionResponse": {
+                            "name": fn_name,
+                            "response": {"result": llm_result},
                         }
-                        break
-
-                    tool_calls = _extract_tool_calls(response)
+                    })
 
-                answer = _extract_text(response)
-                if answer:
-                    logger.info(f"Agent complete: {iteration} iterations, answer={len(answer)} chars")
-                    yield {"type": "answer", "content": answer}
-                else:
-                    logger.warning("Agent complete but no text in final response")
-                    yield {"type": "error", "content": "No response from AI."}
+                conversation.append({"role": "function", "parts": function_responses})
 
-                yield {"type": "done", "content": ""}
+                try:
+                    call = _StreamedLLMCall(conversation, tools)
+                    async for delta in call.deltas():
+                        yield {"type": "answer_delta", "content": delta}
+                    response = await call.response()
+                except StreamInterrupted as e:
+                    # Part of the answer is already on screen; keep it and say it was cut off
+                    logger.error("LLM follow-up stream interrupted: %s", e)
+                    yield {"type": "error", "content": str(e)}
+                    return
+                except Exception as e:
+                    logger.error("LLM follow-up call failed: %s", e)
+                    # Graceful fallback: papers were already sent to frontend
+                    # via tool_result, so show a helpful message instead of error
+                    yield {
+                        "type": "answer",
+                        "content": "I found the papers above but couldn't generate a detailed summary right now due to high demand. You can click on any paper to read more, or try again in about 60 seconds for a full AI summary.",
+                    }
+                    break
+
+                text, tool_calls = _extract_response(response)
+
+            if text:
+                logger.info("Agent complete: %s iterations, answer=%s chars", iteration, len(text))
+                yield {"type": "answer", "content": text}
+            else:
+                logger.warning("Agent complete but no text in final response")
+                yield {"type": "error", "content": "No response from AI."}
+
+            yield {"type": "done", "content": ""}
 
     except Exception as e:
-        logger.error(f"MCP connection failed: {e}")
+        logger.error("MCP connection failed: %s", e)
         yield {"type": "error", "content": f"Could not connect to MCP server: {_sanitize_error(str(e))}"}
+    finally:
+        if plan is not None:
+            plan.cancel()
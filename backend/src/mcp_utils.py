@@ -0,0 +1,34 @@
+"""
+Helpers shared by the stdio and SSE MCP servers.
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable
+
+import orjson
+
+
+def to_json(obj: Any) -> str:
+    """
+    Serialize a tool result as compact JSON.
+    Tool output is read by the model, not a person, so indentation
+    would only add tokens.
+    """
+    return orjson.dumps(obj).decode()
+
+
+def run_in_thread(fn: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """
+    Turn a blocking tool function into an async one that runs in a worker thread.
+
+    FastMCP calls plain `def` tools directly on the event loop, so a tool
+    waiting on arXiv or Gemini would stall every other request. The wrapper
+    keeps the original name, docstring and signature, which FastMCP uses
+    to build the tool's description and input schema.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    return wrapper
@@ -6,9 +6,11 @@ Provides rate limiting, input validation, and prompt injection protection.
 import time
 import re
 import logging
-from typing import Dict, Tuple
-from collections import defaultdict
+import threading
+from functools import lru_cache
+from typing import Tuple
 
+from cachetools import TTLCache
 from fastapi import Request, HTTPException
 
 logger = logging.getLogger(__name__)
@@ -19,34 +21,45 @@ logger = logging.getLogger(__name__)
 # Think of it like a bouncer at a club: each person (IP) gets a limited
 # number of entries per minute. If they try too many times, they wait.
 
+RATE_LIMIT_MAX_IPS = 100_000    # Max IPs tracked at once
+RATE_LIMIT_TTL = 60             # Forget IPs idle longer than the longest window
+
+
 class RateLimiter:
     """In-memory rate limiter that tracks requests per IP."""
 
-    def __init__(self):
+    def __init__(self, max_ips: int = RATE_LIMIT_MAX_IPS, ttl: int = RATE_LIMIT_TTL):
         # Store: { ip_address: [(timestamp1), (timestamp2), ...] }
-        self._requests: Dict[str, list] = defaultdict(list)
+        # Idle IPs expire with the TTL, so memory stays bounded.
+        self._requests: TTLCache = TTLCache(maxsize=max_ips, ttl=ttl)
+        self._lock = threading.Lock()
 
     def _cleanup(self, ip: str, window_seconds: int):
         """Remove old timestamps outside the time window."""
         now = time.time()
         cutoff = now - window_seconds
-        self._requests[ip] = [t for t in self._requests[ip] if t > cutoff]
+        self._requests[ip] = [t for t in self._requests.get(ip, []) if t > cutoff]
 
-    def check(self, ip: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
+    def check(self, ip: str, max_requests: int, window_seconds: int, cost: int = 1) -> Tuple[bool, int]:
         """
         Check if an IP is within its rate limit.
 
+        Args:
+            cost: How many requests this call counts as (e.g. one per item in a batch)
+
         Returns:
             (allowed, remaining) -- True if allowed, plus how many requests remain.
         """
-        self._cleanup(ip, window_seconds)
-        current_count = len(self._requests[ip])
+        with self._lock:
+            self._cleanup(ip, window_seconds)
+            current_count = len(self._requests[ip])
 
-        if current_count >= max_requests:
-            return False, 0
+            if current_count + cost > max_requests:
+                return False, 0
 
-        self._requests[ip].append(time.time())
-        return True, max_requests - current_count - 1
+            now = time.time()
+            self._requests[ip].extend([now] * cost)
+            return True, max_requests - current_count - cost
 
 
 # Global rate limiter instance
@@ -76,7 +89,7 @@ def check_chat_rate_limit(request: Request):
     ip = get_client_ip(request)
     allowed, remaining = rate_limiter.check(ip, CHAT_RATE_LIMIT, CHAT_WINDOW)
     if not allowed:
-        logger.warning(f"Chat rate limit exceeded for IP: {ip}")
+        logger.warning("Chat rate limit exceeded for IP: %s", ip)
         raise HTTPException(
             status_code=429,
             detail="You're sending messages too fast! Please wait a minute and try again.",
@@ -88,19 +101,19 @@ def check_search_rate_limit(request: Request):
     ip = get_client_ip(request)
     allowed, remaining = rate_limiter.check(ip, SEARCH_RATE_LIMIT, SEARCH_WINDOW)
     if not allowed:
-        logger.warning(f"Search rate limit exceeded for IP: {ip}")
+        logger.warning("Search rate limit exceeded for IP: %s", ip)
         raise HTTPException(
             status_code=429,
             detail="Too many searches! Please wait a minute and try again.",
         )
 
 
-def check_general_rate_limit(request: Request):
-    """Enforce rate limit for general endpoints."""
+def check_general_rate_limit(request: Request, cost: int = 1):
+    """Enforce rate limit for general endpoints. Batch routes pass one unit per item."""
     ip = get_client_ip(request)
-    allowed, remaining = rate_limiter.check(ip, GENERAL_RATE_LIMIT, GENERAL_WINDOW)
+    allowed, remaining = rate_limiter.check(ip, GENERAL_RATE_LIMIT, GENERAL_WINDOW, cost)
     if not allowed:
-        logger.warning(f"General rate limit exceeded for IP: {ip}")
+        logger.warning("General rate limit exceeded for IP: %s", ip)
         raise HTTPException(
             status_code=429,
             detail="Too many requests! Please wait a minute and try again.",
@@ -165,7 +178,12 @@ INJECTION_PATTERNS = [
     r"print\s+(your|the)\s+(system|initial)\s+(prompt|instructions)",
 ]
 
-_compiled_patterns = [re.compile(p, re.IGNORECASE) for p in INJECTION_PATTERNS]
+# All patterns merged into one alternation, compiled once at import, so each
+# message is scanned in a single pass no matter how many patterns we add.
+_injection_regex = re.compile(
+    "|".join(f"(?:{p})" for p in INJECTION_PATTERNS),
+    re.IGNORECASE,
+)
 
 
 def check_prompt_injection(message: str) -> bool:
@@ -173,17 +191,18 @@ def check_prompt_injection(message: str) -> bool:
     Check if a message contains prompt injection attempts.
     Returns True if injection is detected.
     """
-    for pattern in _compiled_patterns:
-        if pattern.search(message):
-            logger.warning(f"Prompt injection attempt detected: {message[:100]}...")
-            return True
+    if _injection_regex.search(message):
+        logger.warning("Prompt injection attempt detected: %s...", message[:100])
+        return True
     return False
 
 
+@lru_cache(maxsize=4096)
 def sanitize_message(message: str) -> str:
     """
     Clean a user message before sending to AI.
     Strips control characters and excessive whitespace.
+    Cached because chat history re-sends the same earlier messages every turn.
     """
     message = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', message)
     message = re.sub(r'\s+', ' ', message).strip()
@@ -0,0 +1,116 @@
+"""
+Semantic cache for ArXiv Scholar AI.
+Reuses LLM answers for paraphrased questions about the same paper
+("explain it", "what is this about?") instead of calling the LLM again.
+
+Messages are embedded with Gemini's free embedding endpoint and compared
+by cosine similarity against earlier answers for the same article.
+"""
+
+import logging
+import math
+import operator
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import GOOGLE_API_KEY
+from .gemini_budget import gemini_budget
+from .http_session import http_session
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-004"
+EMBEDDING_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:embedContent?key={key}"
+EMBEDDING_TIMEOUT = 5  # seconds
+
+SIMILARITY_THRESHOLD = 0.92
+CACHE_TTL = 3600                # seconds an answer stays reusable
+MAX_ENTRIES_PER_ARTICLE = 128   # oldest entries are dropped first
+
+
+def embed_text(text: str, timeout: float = EMBEDDING_TIMEOUT) -> Optional[List[float]]:
+    """
+    Embed a short text with Gemini. Returns None if the key is missing,
+    the embedding model is out of its request budget, or the request
+    fails or times out, in which case callers should skip the cache.
+    """
+    if not GOOGLE_API_KEY or not text.strip():
+        return None
+    budget = gemini_budget(EMBEDDING_MODEL)
+    if not budget.try_acquire():
+        return None
+
+    url = EMBEDDING_URL.format(model=EMBEDDING_MODEL, key=GOOGLE_API_KEY)
+    payload = {"content": {"parts": [{"text": text}]}}
+    try:
+        resp = http_session.post(url, json=payload, timeout=timeout)
+        if resp.status_code == 200:
+            budget.succeeded()
+            return resp.json()["embedding"]["values"]
+        if resp.status_code == 429:
+            budget.back_off()
+        logger.warning("Embedding failed: %s", resp.status_code)
+    except Exception as e:
+        logger.warning("Embedding error: %s", e)
+    return None
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length, so cosine similarity is a plain dot product."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    """Dot product of two equal-length vectors."""
+    return sum(map(operator.mul, a, b))
+
+
+class SemanticCache:
+    """In-memory cache of (embedding -> value), namespaced by article ID."""
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: int = CACHE_TTL,
+        max_entries: int = MAX_ENTRIES_PER_ARTICLE,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Store: { namespace: [(expires_at, unit embedding, value), ...] }
+        self._entries: Dict[str, List[Tuple[float, List[float], Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, embedding: List[float]) -> Optional[Any]:
+        """Return the closest cached value above the threshold, if any."""
+        now = time.time()
+        with self._lock:
+            entries = [e for e in self._entries.get(namespace, []) if e[0] > now]
+            self._entries[namespace] = entries
+
+        # Entries are stored normalized, so each comparison is one dot product
+        query = _normalize(embedding)
+        best_score, best_value = 0.0, None
+        for _, cached_embedding, value in entries:
+            score = _dot(query, cached_embedding)
+            if score > best_score:
+                best_score, best_value = score, value
+
+        if best_score >= self.threshold:
+            logger.info("Semantic cache hit for '%s' (similarity=%.3f)", namespace, best_score)
+            return best_value
+        return None
+
+    def put(self, namespace: str, embedding: List[float], value: Any):
+        """Store a value for later paraphrased lookups."""
+        with self._lock:
+            entries = self._entries.setdefault(namespace, [])
+            entries.append((time.time() + self.ttl, _normalize(embedding), value))
+            if len(entries) > self.max_entries:
+                del entries[: len(entries) - self.max_entries]
+
+
+# Global cache instance for chat answers
+chat_cache = SemanticCache()
@@ -4,15 +4,33 @@ Provides Gemini-powered summaries with free local fallback.
 """
 
 import re
+import functools
 import logging
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
-import requests
+from cachetools import TTLCache
+
+try:
+    import anthropic
+except ImportError:  # Claude summaries are optional
+    anthropic = None
 
 from .config import ANTHROPIC_API_KEY, CLAUDE_MODEL, MAX_TOKENS, GOOGLE_API_KEY
+from .gemini_budget import gemini_budget
+from .http_session import http_session
 
 logger = logging.getLogger(__name__)
 
+# Free-tier model for plain-English summaries
+GEMINI_SUMMARY_MODEL = "gemini-2.0-flash-lite"
+
+# Claude summaries keyed by article ID. The prompt is fully determined by the
+# stored metadata, so a repeat request for the same paper reuses the answer.
+_claude_summary_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+_claude_summary_lock = threading.Lock()
+
 
 def _extract_key_sentences(abstract: str, max_sentences: int = 5) -> str:
     """
@@ -116,17 +134,25 @@ Abstract:
 
 Summary:"""
 
-    url = f"https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash-lite:generateContent?key={GOOGLE_API_KEY}"
+    budget = gemini_budget(GEMINI_SUMMARY_MODEL)
+    if not budget.try_acquire():
+        logger.info("Skipping Gemini summary: out of local rate budget")
+        return None
+
+    url = f"https://generativelanguage.googleapis.com/v1/models/{GEMINI_SUMMARY_MODEL}:generateContent?key={GOOGLE_API_KEY}"
     payload = {"contents": [{"parts": [{"text": prompt}]}]}
 
     try:
-        resp = requests.post(url, json=payload, timeout=15)
+        resp = http_session.post(url, json=payload, timeout=15)
         if resp.status_code == 200:
+            budget.succeeded()
             data = resp.json()
             return data["candidates"][0]["content"]["parts"][0]["text"]
-        logger.warning(f"Gemini summary failed: {resp.status_code}")
+        if resp.status_code == 429:
+            budget.back_off()
+        logger.warning("Gemini summary failed: %s", resp.status_code)
     except Exception as e:
-        logger.warning(f"Gemini summary error: {e}")
+        logger.warning("Gemini summary error: %s", e)
 
     return None
 
@@ -135,15 +161,23 @@ def summarize_article(article_data: Dict[str, Any]) -> Optional[str]:
     """
     Generate a summary using Gemini (free), with local extraction as fallback.
     """
+    return summarize_article_with_source(article_data)[0]
+
+
+def summarize_article_with_source(article_data: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+    """
+    summarize_article, plus whether Gemini wrote the summary. False means the
+    local fallback, which callers should not cache: Gemini may be back soon.
+    """
     abstract = article_data.get("summary", "")
     if not abstract:
-        return "No abstract available for this article."
+        return "No abstract available for this article.", False
 
     gemini_summary = _summarize_with_gemini(article_data)
     if gemini_summary:
-        return gemini_summary
+        return gemini_summary, True
 
-    return _extract_key_sentences(abstract)
+    return _extract_key_sentences(abstract), False
 
 
 def explain_like_ten(article_data: Dict[str, Any]) -> Optional[str]:
@@ -158,6 +192,22 @@ def explain_like_ten(article_data: Dict[str, Any]) -> Optional[str]:
     return _simplify_for_kids(abstract)
 
 
+# Static instructions sent as the system prompt; only the paper details
+# change per request. They are far below Anthropic's minimum cacheable
+# prompt length, so no cache_control breakpoint is set until they grow.
+CLAUDE_SUMMARY_INSTRUCTIONS = """You are a research assistant. Summarize academic papers in 3-4 sentences 
+that a smart non-expert could understand. Focus on: what problem it solves, 
+the key approach, and why it matters. Provide a clear, concise summary."""
+
+
+@functools.lru_cache(maxsize=1)
+def _claude_client():
+    """Build the Anthropic client once so its connection pool is reused."""
+    if anthropic is None:
+        raise RuntimeError("the anthropic package is not installed")
+    return anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+
+
 def summarize_with_claude(article_data: Dict[str, Any]) -> Optional[str]:
     """
     Generate an AI-powered summary using Claude (requires API key with credits).
@@ -165,37 +215,60 @@ def summarize_with_claude(article_data: Dict[str, Any]) -> Optional[str]:
     if not ANTHROPIC_API_KEY:
         return "Claude AI summary requires an Anthropic API key. Use the free summary instead!"
 
-    import anthropic
+    article_id = article_data.get("id")
+    if article_id:
+        with _claude_summary_lock:
+            cached = _claude_summary_cache.get(article_id)
+        if cached is not None:
+            return cached
 
     title = article_data.get("title", "Unknown Title")
     authors = ", ".join(article_data.get("authors", []))
     abstract = article_data.get("summary", "No abstract available.")
     published = article_data.get("published", "Unknown date")
 
-    prompt = f"""You are a research assistant. Summarize this academic paper in 3-4 sentences 
-that a smart non-expert could understand. Focus on: what problem it solves, 
-the key approach, and why it matters.
-
-Title: {title}
+    prompt = f"""Title: {title}
 Authors: {authors}
 Published: {published}
 
 Abstract:
-{abstract}
-
-Provide a clear, concise summary:"""
+{abstract}"""
 
     try:
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-
-        response = client.messages.create(
+        response = _claude_client().messages.create(
             model=CLAUDE_MODEL,
             max_tokens=MAX_TOKENS,
+            system=CLAUDE_SUMMARY_INSTRUCTIONS,
             messages=[{"role": "user", "content": prompt}],
         )
 
-        return response.content[0].text
+        summary = response.content[0].text
+        if article_id:
+            with _claude_summary_lock:
+                _claude_summary_cache[article_id] = summary
+        return summary
 
     except Exception as e:
-        logger.error(f"Claude API error: {e}")
+        logger.error("Claude API error: %s", e)
         return f"Claude is unavailable right now. Error: {e}"
+
+
+CLAUDE_BATCH_CONCURRENCY = 5  # Claude requests in flight per batch
+
+
+def summarize_with_claude_batch(articles: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Summarize several papers with Claude, running up to
+    CLAUDE_BATCH_CONCURRENCY requests at once.
+
+    Returns:
+        Dict of article_id -> summary
+    """
+    if not articles:
+        return {}
+
+    workers = min(CLAUDE_BATCH_CONCURRENCY, len(articles))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="claude") as pool:
+        summaries = list(pool.map(summarize_with_claude, articles))
+
+    return {article.get("id"): summary for article, summary in zip(articles, summaries)}
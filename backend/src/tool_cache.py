@@ -0,0 +1,108 @@
+"""
+Result caches for the MCP tools in ArXiv Scholar AI.
+Agents tend to repeat the same tool call many times in a session, so
+searches and Gemini-written summaries are kept for an hour instead of
+hitting arXiv or the LLM again. Also home to the batch
+summarizer behind the summarize_papers tool.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+
+from .article_finder import find_articles
+from .article_reader import get_article_details
+from .summarizer import summarize_article_with_source
+
+TOOL_CACHE_TTL = 3600  # seconds a tool result stays reusable
+MAX_BATCH_PAPERS = 10  # cap on papers per summarize_papers call
+
+_search_cache: TTLCache = TTLCache(maxsize=512, ttl=TOOL_CACHE_TTL)
+_summary_cache: TTLCache = TTLCache(maxsize=1024, ttl=TOOL_CACHE_TTL)
+_lock = threading.Lock()
+
+
+def normalize_topic(topic: str) -> str:
+    """Lowercase a search topic and collapse its whitespace for cache keys."""
+    return " ".join(topic.lower().split())
+
+
+def cached_find_articles(
+    topic: str,
+    max_results: int,
+    sort_by: str = "relevance",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    find_articles with a TTL cache keyed by the normalized search arguments.
+    Errors (e.g. arXiv 429s) propagate and are not cached.
+    """
+    key = (normalize_topic(topic), max_results, sort_by, date_from, date_to)
+    with _lock:
+        cached = _search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    articles = find_articles(
+        topic=topic,
+        max_results=max_results,
+        sort_by=sort_by,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    with _lock:
+        _search_cache[key] = articles
+    return articles
+
+
+def cached_summary(article: Dict[str, Any]) -> Optional[str]:
+    """
+    summarize_article, cached by article id. Only summaries Gemini wrote are
+    cached; the local fallback is returned uncached so the next call retries
+    Gemini instead of serving the degraded text for an hour.
+    """
+    key = article.get("id")
+    with _lock:
+        cached = _summary_cache.get(key)
+    if cached is not None:
+        return cached
+
+    text, from_gemini = summarize_article_with_source(article)
+    if text and from_gemini:
+        with _lock:
+            _summary_cache[key] = text
+    return text
+
+
+async def summarize_many(article_ids: List[str]) -> Dict[str, Any]:
+    """
+    Summarize several papers concurrently, each in a worker thread.
+
+    Args:
+        article_ids: arXiv short IDs (duplicates are ignored, at most MAX_BATCH_PAPERS
+            are summarized)
+
+    Returns:
+        {"summaries": {article ID: summary, or None for papers that aren't stored}},
+        plus "skipped": [IDs past MAX_BATCH_PAPERS] when the list was cut short
+    """
+    unique_ids = list(dict.fromkeys(article_ids))
+    ids, skipped = unique_ids[:MAX_BATCH_PAPERS], unique_ids[MAX_BATCH_PAPERS:]
+    articles = await asyncio.gather(
+        *(asyncio.to_thread(get_article_details, article_id) for article_id in ids)
+    )
+
+    async def summarize(article: Optional[Dict[str, Any]]) -> Optional[str]:
+        if article is None:
+            return None
+        return await asyncio.to_thread(cached_summary, article)
+
+    summaries = await asyncio.gather(*(summarize(article) for article in articles))
+    result: Dict[str, Any] = {"summaries": dict(zip(ids, summaries))}
+    if skipped:
+        # Say so instead of dropping them, so the caller can ask again
+        result["skipped"] = skipped
+    return result
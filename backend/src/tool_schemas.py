@@ -0,0 +1,118 @@
+"""
+MCP tool schema converters for ArXiv Scholar AI.
+Turns the tool list an MCP server advertises into Gemini function
+declarations and OpenAI function tools. Shared by the web agent
+(src/mcp_agent.py) and the CLI client (mcp_client.py).
+"""
+
+import functools
+import json
+
+# Gemini's upper-case schema types; anything else falls back to STRING
+GEMINI_TYPES = frozenset({"STRING", "INTEGER", "NUMBER", "BOOLEAN", "ARRAY", "OBJECT"})
+
+
+def snapshot_tools(mcp_tools: list) -> tuple:
+    """
+    Hashable snapshot of the MCP tool definitions. The converters below are
+    cached on it, so every agent run against the same server reuses one
+    conversion instead of rebuilding the declarations per request.
+
+    Tools are sorted by name (and the converters sort properties), so the
+    declarations are byte-identical across calls and server restarts and
+    Gemini's implicit prompt cache can match the request prefix.
+    """
+    return tuple(
+        (tool.name, tool.description or "", json.dumps(tool.inputSchema or {}, sort_keys=True))
+        for tool in sorted(mcp_tools, key=lambda tool: tool.name)
+    )
+
+
+def _json_type(prop: dict) -> str:
+    """A property's JSON Schema type; the first non-null one if it lists several."""
+    prop_type = prop.get("type", "string")
+    if isinstance(prop_type, list):
+        prop_type = next((t for t in prop_type if t != "null"), "string")
+    return prop_type
+
+
+def _gemini_schema(prop: dict) -> dict:
+    """One JSON Schema property as a Gemini schema, array items and nested objects included."""
+    prop_type = _json_type(prop).upper()
+    schema: dict = {
+        "type": prop_type if prop_type in GEMINI_TYPES else "STRING",
+        "description": prop.get("description", ""),
+    }
+    if schema["type"] == "ARRAY":
+        # Gemini rejects an array without items (400), so default to strings
+        schema["items"] = _gemini_schema(prop.get("items") or {})
+    elif schema["type"] == "OBJECT" and prop.get("properties"):
+        schema["properties"] = {name: _gemini_schema(sub) for name, sub in sorted(prop["properties"].items())}
+        schema["required"] = sorted(prop.get("required", []))
+    return schema
+
+
+def _openai_schema(prop: dict) -> dict:
+    """One JSON Schema property in OpenAI's format, array items and nested objects included."""
+    prop_type = _json_type(prop)
+    schema: dict = {"type": prop_type, "description": prop.get("description", "")}
+    if prop_type == "array":
+        # OpenAI also rejects an array without items
+        schema["items"] = _openai_schema(prop.get("items") or {})
+    elif prop_type == "object" and prop.get("properties"):
+        schema["properties"] = {name: _openai_schema(sub) for name, sub in sorted(prop["properties"].items())}
+        schema["required"] = sorted(prop.get("required", []))
+    return schema
+
+
+def _check_array_items(tool_name: str, schema: dict, path: str = ""):
+    """Raise ValueError if any array in a converted schema lacks items."""
+    if schema.get("type", "").lower() == "array":
+        if "items" not in schema:
+            raise ValueError(f"Tool {tool_name!r}: array {path or 'parameters'} has no items")
+        _check_array_items(tool_name, schema["items"], f"{path}[]")
+    for name, sub in schema.get("properties", {}).items():
+        _check_array_items(tool_name, sub, f"{path}.{name}" if path else name)
+
+
+@functools.lru_cache(maxsize=8)
+def mcp_tools_to_gemini(tool_key: tuple) -> list:
+    """Convert MCP tool schemas to Gemini function declarations. Treat the result as read-only."""
+    declarations = []
+    for tool_name, description, schema_json in tool_key:
+        schema = json.loads(schema_json)
+        parameters = {
+            "type": "OBJECT",
+            "properties": {name: _gemini_schema(prop) for name, prop in sorted(schema.get("properties", {}).items())},
+            "required": sorted(schema.get("required", [])),
+        }
+        _check_array_items(tool_name, parameters)
+        declarations.append({
+            "name": tool_name,
+            "description": description,
+            "parameters": parameters,
+        })
+    return declarations
+
+
+@functools.lru_cache(maxsize=8)
+def mcp_tools_to_openai(tool_key: tuple) -> list:
+    """Convert MCP tool schemas to OpenAI function tool format. Treat the result as read-only."""
+    tools = []
+    for tool_name, description, schema_json in tool_key:
+        schema = json.loads(schema_json)
+        parameters = {
+            "type": "object",
+            "properties": {name: _openai_schema(prop) for name, prop in sorted(schema.get("properties", {}).items())},
+            "required": sorted(schema.get("required", [])),
+        }
+        _check_array_items(tool_name, parameters)
+        tools.append({
+            "type": "function",
+            "function": {
+                "name": tool_name,
+                "description": description,
+                "parameters": parameters,
+            },
+        })
+    return tools
@@ -6,9 +6,9 @@ Uses Gemini to infer a 1-3 word topic from random or off-topic questions.
 import logging
 import re
 
-import requests
-
 from .config import GOOGLE_API_KEY
+from .gemini_budget import gemini_budget
+from .http_session import http_session
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,8 @@ MODEL = "gemini-2.0-flash-lite"
 def suggest_topic(query: str) -> str | None:
     """
     Infer a short (1-3 word) research topic from the user's query, suitable for arXiv search.
-    Returns None if API key is missing, request fails, or result is empty.
+    Returns None if API key is missing, the model is out of request budget,
+    the request fails, or the result is empty.
     """
     if not GOOGLE_API_KEY or not (query or "").strip():
         return None
@@ -35,12 +36,19 @@ def suggest_topic(query: str) -> str | None:
     )
     payload = {"contents": [{"parts": [{"text": prompt}]}]}
 
+    budget = gemini_budget(MODEL)
+    if not budget.try_acquire():
+        return None
+
     url = f"{API_BASE}/{MODEL}:generateContent?key={GOOGLE_API_KEY}"
     try:
-        resp = requests.post(url, json=payload, timeout=10)
+        resp = http_session.post(url, json=payload, timeout=10)
         if resp.status_code != 200:
-            logger.warning(f"Topic suggest {MODEL}: {resp.status_code}")
+            if resp.status_code == 429:
+                budget.back_off()
+            logger.warning("Topic suggest %s: %s", MODEL, resp.status_code)
             return None
+        budget.succeeded()
         data = resp.json()
         text = (
             data.get("candidates", [{}])[0]
@@ -54,5 +62,5 @@ def suggest_topic(query: str) -> str | None:
         text = re.sub(r"[^\w\s\-]", "", text)[:50].strip()
         return text if text else None
     except Exception as e:
-        logger.warning(f"Topic suggest {MODEL}: {e}")
+        logger.warning("Topic suggest %s: %s", MODEL, e)
         return None
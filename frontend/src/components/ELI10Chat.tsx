@@ -2,7 +2,11 @@
 
 import { useState, useRef, useEffect } from "react";
 import { ChatMessage } from "@/lib/types";
-import { chatWithArticle } from "@/lib/api";
+import { chatWithArticle, streamChatWithArticle } from "@/lib/api";
+
+// Streaming is opt-in: /api/chat has the semantic cache, request coalescing,
+// hedging and adaptive timeouts that the stream route doesn't
+const STREAM_CHAT = process.env.NEXT_PUBLIC_CHAT_STREAMING === "true";
 
 interface ELI10ChatProps {
   articleId: string;
@@ -57,21 +61,30 @@ export default function ELI10Chat({ articleId, articleTitle }: ELI10ChatProps) {
         .filter((m) => m !== GREETING)
         .map((m) => ({ role: m.role, content: m.content }));
 
-      const result = await chatWithArticle(
-        articleId,
-        text.trim(),
-        history.slice(0, -1)
-      );
-
-      // Check if there was an error
-      if (result.error_type) {
+      // When streaming, show the answer as it arrives, replacing the loading bubble
+      let answer = "";
+      const result = STREAM_CHAT
+        ? await streamChatWithArticle(
+            articleId,
+            text.trim(),
+            history.slice(0, -1),
+            (delta) => {
+              answer += delta;
+              const content = answer;
+              setMessages([...updatedMessages, { role: "assistant", content }]);
+            }
+          )
+        : await chatWithArticle(articleId, text.trim(), history.slice(0, -1));
+
+      // Only report an error if nothing arrived; partial answers stay on screen
+      if (!answer && result.error_type) {
         setError(result.response);
         setSuggestion(
           result.error_type === "rate_limited"
             ? "The AI is processing too many requests. Please wait about 60 seconds and try again."
             : "Please try again in a moment."
         );
-      } else {
+      } else if (!answer) {
         setMessages((prev) => [
           ...prev,
           { role: "assistant", content: result.response },
@@ -154,7 +167,7 @@ export default function ELI10Chat({ articleId, articleTitle }: ELI10ChatProps) {
         )}
 
         {/* Loading indicator */}
-        {isLoading && (
+        {isLoading && messages[messages.length - 1].role === "user" && (
           <div className="flex justify-start">
             <div className="bg-gray-50 text-gray-500 border border-gray-200 px-4 py-2.5 rounded-2xl rounded-bl-md shadow-sm text-sm">
               <span className="inline-flex gap-1">
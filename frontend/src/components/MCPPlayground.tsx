@@ -115,6 +115,7 @@ function ElapsedTimer({ startTime }: { startTime: number }) {
 export default function MCPPlayground() {
   const [query, setQuery] = useState("");
   const [steps, setSteps] = useState<MCPStep[]>([]);
+  const [answer, setAnswer] = useState("");
   const [papers, setPapers] = useState<Article[]>([]);
   const [selectedArticle, setSelectedArticle] = useState<Article | null>(null);
   const [isStreaming, setIsStreaming] = useState(false);
@@ -180,6 +181,12 @@ export default function MCPPlayground() {
       try {
         const step: MCPStep = JSON.parse(event.data);
 
+        // Partial answer text, shown as it streams in
+        if (step.type === "answer_delta") {
+          setAnswer((prev) => prev + (step.content as string));
+          return;
+        }
+
         if (step.type === "done") {
           es.close();
           setIsStreaming(false);
@@ -187,6 +194,7 @@ export default function MCPPlayground() {
           return;
         }
         if (step.type === "answer") {
+          setAnswer(step.content as string);
           es.close();
           setIsStreaming(false);
           if (papersCountRef.current === 0) setRunEndedWithNoPapers(true);
@@ -199,6 +207,10 @@ export default function MCPPlayground() {
           return;
         }
 
+        // Text streamed before a tool call was the model thinking out loud,
+        // not the answer
+        if (step.type === "tool_call") setAnswer("");
+
         setSteps((prev) => [...prev, step]);
 
         if (step.type === "tool_result") {
@@ -238,6 +250,7 @@ export default function MCPPlayground() {
     if (!q.trim() || isStreaming) return;
 
     setSteps([]);
+    setAnswer("");
     setPapers([]);
     setSelectedArticle(null);
     setError(null);
@@ -418,6 +431,17 @@ export default function MCPPlayground() {
               return null;
             })}
 
+            {answer && (
+              <div className="border-l-2 border-blue-400 pl-3">
+                <p className="text-xs font-medium text-gray-400 mb-1">
+                  Answer
+                </p>
+                <p className="text-sm text-gray-700 whitespace-pre-line">
+                  {answer}
+                </p>
+              </div>
+            )}
+
             {isStreaming && (
               <div className="border-l-2 border-blue-400 pl-3">
                 <p className="text-xs font-medium text-gray-400 mb-1">
@@ -144,6 +144,70 @@ export async function chatWithArticle(
   return response.json();
 }
 
+/**
+ * Streaming version of chatWithArticle.
+ * Calls onDelta with each piece of the answer as it is generated, then
+ * resolves with the full answer once the backend sends its final event.
+ */
+export async function streamChatWithArticle(
+  articleId: string,
+  message: string,
+  history: ChatMessage[],
+  onDelta: (text: string) => void
+): Promise<ChatResponse> {
+  const response = await fetch(`${API_BASE}/api/chat/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({
+      article_id: articleId,
+      message,
+      history,
+    }),
+  });
+
+  if (!response.ok || !response.body) {
+    if (response.status === 429) {
+      throw new Error("You're sending messages too fast! Please wait about 60 seconds and try again.");
+    }
+    const errorData = await response.json().catch(() => null);
+    throw new Error(errorData?.detail || `Something went wrong. Please try again.`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let answer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Keep a trailing partial line in the buffer until the rest arrives
+    const lines = buffer.split(/\r?\n/);
+    buffer = lines.pop() ?? "";
+
+    for (const line of lines) {
+      if (!line.startsWith("data:")) continue;
+      const event = JSON.parse(line.slice(5).trim());
+      if (event.delta) {
+        answer += event.delta;
+        onDelta(event.delta);
+      } else if (event.done) {
+        await reader.cancel();
+        return {
+          response: answer || event.suggestion || "Something went wrong. Please try again.",
+          provider: event.provider,
+          error_type: event.error_type,
+          suggestion: event.suggestion,
+        };
+      }
+    }
+  }
+
+  throw new Error("The answer was cut off. Please try again.");
+}
+
 /**
  * List all topics that have been searched.
  */
@@ -48,7 +48,7 @@ export interface ChatResponse {
 }
 
 // MCP Agent reasoning step types
-export type MCPStepType = "thinking" | "tool_call" | "tool_result" | "answer" | "error" | "done";
+export type MCPStepType = "thinking" | "tool_call" | "tool_result" | "answer_delta" | "answer" | "error" | "done";
 
 export interface MCPStep {
   type: MCPStepType;